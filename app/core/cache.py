@@ -0,0 +1,153 @@
+"""
+Shared response cache for external search providers.
+
+Two tiers:
+- In-process LRU bounded by entry count and TTL
+- Optional Mongo collection shared by all workers
+"""
+
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.config import settings
+from app.core.database import get_async_database
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache for provider responses, keyed by namespace and
+    request parameters. Empty responses are never cached, so failures
+    and "no results" are always retried.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, mongo_enabled: bool = False):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.mongo_enabled = mongo_enabled
+        self.collection_name = "response_cache"
+
+        # key -> (expires_at monotonic, value)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: dict = {}
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    def make_key(self, namespace: str, key_parts: list) -> str:
+        raw = json.dumps(key_parts, sort_keys=True, default=str)
+        return f"{namespace}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+    async def get_or_fetch(
+        self,
+        namespace: str,
+        key_parts: list,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return a cached response, or await `fetch()` and cache its result.
+        Mongo round-trips go through the async client.
+        """
+        key = self.make_key(namespace, key_parts)
+
+        value = self._memory_get(key)
+        if value is not None:
+            self._count(namespace, "memory_hits")
+            return copy.deepcopy(value)
+
+        if self.mongo_enabled:
+            value = await self._mongo_get(key)
+            if value is not None:
+                self._count(namespace, "mongo_hits")
+                self._memory_set(key, value)
+                return copy.deepcopy(value)
+
+        self._count(namespace, "misses")
+        value = await fetch()
+
+        if value:
+            self._memory_set(key, value)
+            if self.mongo_enabled:
+                await self._mongo_set(namespace, key, value)
+
+        return value
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "mongo_enabled": self.mongo_enabled,
+            "namespaces": copy.deepcopy(self._counters)
+        }
+
+    # --------------------------------------------------
+    # In-process tier
+    # --------------------------------------------------
+    def _memory_get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def _memory_set(self, key: str, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # --------------------------------------------------
+    # Mongo tier
+    # --------------------------------------------------
+    async def _mongo_get(self, key: str) -> Optional[Any]:
+        try:
+            doc = await get_async_database()[self.collection_name].find_one({
+                "_id": key,
+                "expires_at": {"$gt": datetime.utcnow()}
+            })
+            return doc["value"] if doc else None
+
+        except Exception as e:
+            print(f"⚠️ Response cache read failed: {e}")
+            return None
+
+    async def _mongo_set(self, namespace: str, key: str, value: Any):
+        try:
+            await get_async_database()[self.collection_name].update_one(
+                {"_id": key},
+                {"$set": {
+                    "namespace": namespace,
+                    "value": value,
+                    "expires_at": datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                }},
+                upsert=True
+            )
+
+        except Exception as e:
+            print(f"⚠️ Response cache write failed: {e}")
+
+    def _count(self, namespace: str, counter: str):
+        counters = self._counters.setdefault(
+            namespace,
+            {"memory_hits": 0, "mongo_hits": 0, "misses": 0}
+        )
+        counters[counter] += 1
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    mongo_enabled=settings.RESPONSE_CACHE_MONGO_ENABLED
+)
@@ -21,6 +21,12 @@ class Settings:
     # MongoDB settings
     MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     MONGODB_DB_NAME: str = os.getenv("MONGODB_DB_NAME", "waypoint_db")
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    MONGODB_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "10000"))
+    MONGODB_SOCKET_TIMEOUT_MS: int = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "20000"))
+    MONGODB_WRITE_CONCERN: str = os.getenv("MONGODB_WRITE_CONCERN", "1")
     
     # Gemini API settings
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
@@ -34,6 +40,114 @@ class Settings:
     #SerpAPI api
     SERPAPI_KEY: str = os.getenv("SERPAPI_KEY", "")
     
+    # Stream dashboard sections from Gemini as they are generated
+    GEMINI_STREAM_SECTIONS: bool = os.getenv("GEMINI_STREAM_SECTIONS", "true").lower() == "true"
+    
+    # Dashboard expansion shards generated in parallel (1 = single call)
+    DASHBOARD_SHARD_COUNT: int = int(os.getenv("DASHBOARD_SHARD_COUNT", "4"))
+    
+    # Data collection settings (per-source timeout budget, seconds)
+    COLLECTOR_TAVILY_TIMEOUT: float = float(os.getenv("COLLECTOR_TAVILY_TIMEOUT", "30"))
+    COLLECTOR_PRODUCTHUNT_TIMEOUT: float = float(os.getenv("COLLECTOR_PRODUCTHUNT_TIMEOUT", "15"))
+    COLLECTOR_SERPAPI_TIMEOUT: float = float(os.getenv("COLLECTOR_SERPAPI_TIMEOUT", "25"))
+    
+    # Competitor enrichment (scrape the top-N Tavily competitors)
+    ENRICH_TOP_COMPETITORS: int = int(os.getenv("ENRICH_TOP_COMPETITORS", "5"))
+    SCRAPE_CONCURRENCY: int = int(os.getenv("SCRAPE_CONCURRENCY", "4"))
+    SCRAPE_DEADLINE_SECONDS: float = float(os.getenv("SCRAPE_DEADLINE_SECONDS", "20"))
+    SCRAPE_LEAN_MODE: bool = os.getenv("SCRAPE_LEAN_MODE", "true").lower() == "true"
+    SCRAPE_READY_CAP_MS: int = int(os.getenv("SCRAPE_READY_CAP_MS", "3000"))
+    SCRAPE_STATIC_FIRST: bool = os.getenv("SCRAPE_STATIC_FIRST", "true").lower() == "true"
+    SCRAPE_STATIC_TIMEOUT: float = float(os.getenv("SCRAPE_STATIC_TIMEOUT", "8"))
+    SCRAPE_STATIC_MIN_TEXT: int = int(os.getenv("SCRAPE_STATIC_MIN_TEXT", "400"))
+    SCRAPE_CACHE_ENABLED: bool = os.getenv("SCRAPE_CACHE_ENABLED", "true").lower() == "true"
+    SCRAPE_CACHE_TTL_SECONDS: int = int(os.getenv("SCRAPE_CACHE_TTL_SECONDS", "86400"))
+    
+    # Background analysis jobs
+    ANALYSIS_WORKER_CONCURRENCY: int = int(os.getenv("ANALYSIS_WORKER_CONCURRENCY", "4"))
+    ANALYSIS_QUEUE_MAX_SIZE: int = int(os.getenv("ANALYSIS_QUEUE_MAX_SIZE", "100"))
+    JOB_STATE_FLUSH_INTERVAL_MS: int = int(os.getenv("JOB_STATE_FLUSH_INTERVAL_MS", "1000"))
+    # Seconds running jobs get to finish on shutdown before they are marked failed
+    JOB_SHUTDOWN_GRACE_SECONDS: float = float(os.getenv("JOB_SHUTDOWN_GRACE_SECONDS", "10"))
+    
+    # End-to-end analysis deadline per tier (seconds). Collection stops
+    # early enough to leave ANALYSIS_LLM_RESERVE_SECONDS for Gemini.
+    ANALYSIS_DEADLINE_PRELAUNCH_SECONDS: float = float(os.getenv("ANALYSIS_DEADLINE_PRELAUNCH_SECONDS", "150"))
+    ANALYSIS_DEADLINE_POSTLAUNCH_SECONDS: float = float(os.getenv("ANALYSIS_DEADLINE_POSTLAUNCH_SECONDS", "180"))
+    ANALYSIS_LLM_RESERVE_SECONDS: float = float(os.getenv("ANALYSIS_LLM_RESERVE_SECONDS", "90"))
+    
+    # Analysis result cache
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RESULT_CACHE_TTL_SECONDS: int = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "86400"))
+
+    # In-flight deduplication of identical analyses
+    SINGLEFLIGHT_ENABLED: bool = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+    SINGLEFLIGHT_MONGO_LEASE: bool = os.getenv("SINGLEFLIGHT_MONGO_LEASE", "false").lower() == "true"
+    SINGLEFLIGHT_LEASE_SECONDS: int = int(os.getenv("SINGLEFLIGHT_LEASE_SECONDS", "900"))
+    SINGLEFLIGHT_POLL_SECONDS: float = float(os.getenv("SINGLEFLIGHT_POLL_SECONDS", "2"))
+
+    # Raw market data store ("zstd" needs the optional zstandard package)
+    RAW_STORE_COMPRESSION: str = os.getenv("RAW_STORE_COMPRESSION", "zstd")
+    
+    # Provider response cache
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "21600"))
+    RESPONSE_CACHE_MONGO_ENABLED: bool = os.getenv("RESPONSE_CACHE_MONGO_ENABLED", "false").lower() == "true"
+    
+    # Server-Sent Events
+    SSE_KEEPALIVE_SECONDS: float = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+    
+    # Shared Chromium browser pool for scraping
+    BROWSER_POOL_PRELAUNCH: bool = os.getenv("BROWSER_POOL_PRELAUNCH", "false").lower() == "true"
+    BROWSER_POOL_MAX_CONTEXTS: int = int(os.getenv("BROWSER_POOL_MAX_CONTEXTS", "2"))
+    BROWSER_POOL_MAX_PAGES: int = int(os.getenv("BROWSER_POOL_MAX_PAGES", "4"))
+    BROWSER_POOL_PAGE_MAX_USES: int = int(os.getenv("BROWSER_POOL_PAGE_MAX_USES", "20"))
+    
+    # MongoDB index settings
+    FAILED_JOB_TTL_SECONDS: int = int(os.getenv("FAILED_JOB_TTL_SECONDS", "0"))
+    
+    # Shared outbound HTTP client (HTTP/2 needs the optional h2 package)
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "20"))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    
+    # External provider limits (rate per second, burst, concurrent calls,
+    # daily quota; quota 0 = unlimited). All are account-wide totals. The
+    # daily quota is counted in Mongo; rate, burst and concurrency are
+    # enforced per process, so each worker takes 1/PROVIDER_LIMIT_WORKERS
+    # of them. Set it to the number of uvicorn/gunicorn worker processes.
+    PROVIDER_LIMIT_WORKERS: int = int(os.getenv("PROVIDER_LIMIT_WORKERS", os.getenv("WEB_CONCURRENCY", "1")))
+    TAVILY_RATE_PER_SECOND: float = float(os.getenv("TAVILY_RATE_PER_SECOND", "5"))
+    TAVILY_BURST: int = int(os.getenv("TAVILY_BURST", "10"))
+    TAVILY_MAX_CONCURRENCY: int = int(os.getenv("TAVILY_MAX_CONCURRENCY", "8"))
+    TAVILY_DAILY_QUOTA: int = int(os.getenv("TAVILY_DAILY_QUOTA", "0"))
+    PRODUCTHUNT_RATE_PER_SECOND: float = float(os.getenv("PRODUCTHUNT_RATE_PER_SECOND", "2"))
+    PRODUCTHUNT_BURST: int = int(os.getenv("PRODUCTHUNT_BURST", "4"))
+    PRODUCTHUNT_MAX_CONCURRENCY: int = int(os.getenv("PRODUCTHUNT_MAX_CONCURRENCY", "2"))
+    PRODUCTHUNT_DAILY_QUOTA: int = int(os.getenv("PRODUCTHUNT_DAILY_QUOTA", "0"))
+    SERPAPI_RATE_PER_SECOND: float = float(os.getenv("SERPAPI_RATE_PER_SECOND", "1"))
+    SERPAPI_BURST: int = int(os.getenv("SERPAPI_BURST", "3"))
+    SERPAPI_MAX_CONCURRENCY: int = int(os.getenv("SERPAPI_MAX_CONCURRENCY", "3"))
+    SERPAPI_DAILY_QUOTA: int = int(os.getenv("SERPAPI_DAILY_QUOTA", "0"))
+    GEMINI_RATE_PER_SECOND: float = float(os.getenv("GEMINI_RATE_PER_SECOND", "2"))
+    GEMINI_BURST: int = int(os.getenv("GEMINI_BURST", "5"))
+    GEMINI_MAX_CONCURRENCY: int = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+    GEMINI_DAILY_QUOTA: int = int(os.getenv("GEMINI_DAILY_QUOTA", "0"))
+    # Pause after a 429 without Retry-After
+    PROVIDER_BACKOFF_SECONDS: float = float(os.getenv("PROVIDER_BACKOFF_SECONDS", "10"))
+    
+    # Hedged requests and adaptive timeouts for idempotent searches
+    HEDGE_ENABLED: bool = os.getenv("HEDGE_ENABLED", "true").lower() == "true"
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", "0.9"))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    LATENCY_WINDOW_SIZE: int = int(os.getenv("LATENCY_WINDOW_SIZE", "200"))
+    ADAPTIVE_TIMEOUT_PERCENTILE: float = float(os.getenv("ADAPTIVE_TIMEOUT_PERCENTILE", "0.99"))
+    ADAPTIVE_TIMEOUT_MULTIPLIER: float = float(os.getenv("ADAPTIVE_TIMEOUT_MULTIPLIER", "2"))
+    ADAPTIVE_TIMEOUT_MIN_SECONDS: float = float(os.getenv("ADAPTIVE_TIMEOUT_MIN_SECONDS", "5"))
+    
     # App settings
     ENV: str = os.getenv("ENV", "development")
     DEBUG: bool = os.getenv("DEBUG", "true").lower() == "true"
@@ -1,12 +1,32 @@
 """
 Database connection and utilities.
+
+The request path uses the async Motor client; the sync pymongo client
+is kept for scripts and the remaining synchronous helpers.
 """
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import MongoClient, ASCENDING, DESCENDING
 from pymongo.database import Database
+from pymongo.errors import OperationFailure
 from app.core.config import settings
 
 
+def client_options() -> dict:
+    """
+    Pool, timeout and write concern options shared by both clients.
+    """
+    write_concern = settings.MONGODB_WRITE_CONCERN
+    return {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS,
+        "w": int(write_concern) if write_concern.isdigit() else write_concern
+    }
+
+
 class MongoDB:
     """
     MongoDB connection manager.
@@ -15,13 +35,15 @@ class MongoDB:
     def __init__(self):
         self.client: MongoClient | None = None
         self.database: Database | None = None
+        self.async_client: AsyncIOMotorClient | None = None
+        self.async_database: AsyncIOMotorDatabase | None = None
 
     def connect(self):
         if self.database is not None:
             return  # Already connected
 
         try:
-            self.client = MongoClient(settings.MONGODB_URL)
+            self.client = MongoClient(settings.MONGODB_URL, **client_options())
             self.database = self.client[settings.MONGODB_DB_NAME]
             self.client.admin.command("ping")
 
@@ -31,18 +53,115 @@ class MongoDB:
             print(f"❌ Error connecting to MongoDB: {e}")
             raise
 
+    async def connect_async(self):
+        """
+        Open the async client. Called from the app lifespan.
+        """
+        try:
+            await self.get_async_database().client.admin.command("ping")
+            print(f"✅ Connected to MongoDB (async): {settings.MONGODB_DB_NAME}")
+
+        except Exception as e:
+            print(f"❌ Error connecting to MongoDB: {e}")
+            raise
+
     def close(self):
+        if self.async_client:
+            self.async_client.close()
+            self.async_client = None
+            self.async_database = None
+
         if self.client:
             self.client.close()
             self.client = None
             self.database = None
-            print("👋 MongoDB connection closed")
+
+        print("👋 MongoDB connection closed")
 
     def get_database(self) -> Database:
         if self.database is None:
             self.connect()
         return self.database
 
+    def get_async_database(self) -> AsyncIOMotorDatabase:
+        # Motor connects lazily on the first operation
+        if self.async_database is None:
+            self.async_client = AsyncIOMotorClient(settings.MONGODB_URL, **client_options())
+            self.async_database = self.async_client[settings.MONGODB_DB_NAME]
+        return self.async_database
+
+    async def ensure_indexes(self):
+        """
+        Create the indexes the app relies on. Safe to run on every startup.
+        """
+        db = self.get_async_database()
+
+        analyses = db["analyses"]
+        await analyses.create_index([("job_id", ASCENDING)], name="job_id_unique", unique=True)
+        await analyses.create_index(
+            [("email", ASCENDING), ("created_at", DESCENDING)],
+            name="email_created_at"
+        )
+        await analyses.create_index(
+            [("idea_fingerprint", ASCENDING), ("status", ASCENDING), ("completed_at", DESCENDING)],
+            name="idea_fingerprint_status_completed_at"
+        )
+        await analyses.create_index(
+            [("leader_job_id", ASCENDING)],
+            name="leader_job_id",
+            sparse=True
+        )
+        await self._ensure_failed_job_ttl(analyses)
+
+        # Expired documents are removed by Mongo, lookups already filter on expires_at
+        await db["response_cache"].create_index(
+            [("expires_at", ASCENDING)],
+            name="expires_at_ttl",
+            expireAfterSeconds=0
+        )
+        await db["scrapes"].create_index([("fingerprint", ASCENDING)], name="fingerprint_unique", unique=True)
+        await db["analysis_leases"].create_index(
+            [("expires_at", ASCENDING)],
+            name="expires_at_ttl",
+            expireAfterSeconds=0
+        )
+        # Daily provider quota counters, kept for a month
+        await db["provider_usage"].create_index(
+            [("created_at", ASCENDING)],
+            name="created_at_ttl",
+            expireAfterSeconds=35 * 24 * 3600
+        )
+        await db["analysis_raw"].create_index([("job_id", ASCENDING)], name="job_id_unique", unique=True)
+
+        print("✅ MongoDB indexes ensured")
+
+    async def _ensure_failed_job_ttl(self, analyses):
+        """
+        Optionally expire failed jobs FAILED_JOB_TTL_SECONDS after they fail.
+        Set to 0 to keep them forever.
+        """
+        name = "failed_jobs_ttl"
+        ttl = settings.FAILED_JOB_TTL_SECONDS
+
+        if ttl <= 0:
+            if name in await analyses.index_information():
+                await analyses.drop_index(name)
+            return
+
+        try:
+            await analyses.create_index(
+                [("completed_at", ASCENDING)],
+                name=name,
+                expireAfterSeconds=ttl,
+                partialFilterExpression={"status": "failed"}
+            )
+        except OperationFailure:
+            # Index exists with a different TTL: update it in place
+            await analyses.database.command({
+                "collMod": analyses.name,
+                "index": {"name": name, "expireAfterSeconds": ttl}
+            })
+
 
 # Global instance
 mongodb = MongoDB()
@@ -54,3 +173,10 @@ def get_database() -> Database:
     Auto-connects if needed.
     """
     return mongodb.get_database()
+
+
+def get_async_database() -> AsyncIOMotorDatabase:
+    """
+    Async (Motor) database accessor for the request path.
+    """
+    return mongodb.get_async_database()
@@ -0,0 +1,48 @@
+"""
+End-to-end deadlines for analysis runs.
+
+A deadline is fixed when a run starts and handed to every phase, which
+caps its own timeouts by the time that is left instead of starting a
+fresh budget of its own.
+"""
+
+import time
+from typing import Optional
+
+from app.core.config import settings
+
+
+class Deadline:
+    """
+    Absolute point in time (monotonic clock) a run must finish by.
+    """
+
+    def __init__(self, seconds: float, at: Optional[float] = None):
+        self.seconds = seconds
+        self.at = at if at is not None else time.monotonic() + seconds
+
+    @classmethod
+    def for_tier(cls, tier: str) -> "Deadline":
+        seconds = {
+            "prelaunch": settings.ANALYSIS_DEADLINE_PRELAUNCH_SECONDS,
+            "postlaunch": settings.ANALYSIS_DEADLINE_POSTLAUNCH_SECONDS,
+        }.get(tier, settings.ANALYSIS_DEADLINE_POSTLAUNCH_SECONDS)
+        return cls(seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cap(self, timeout: float) -> float:
+        """
+        `timeout`, shortened to the time left before the deadline.
+        """
+        return min(timeout, self.remaining())
+
+    def reserve(self, seconds: float) -> "Deadline":
+        """
+        Earlier deadline that leaves `seconds` for the phases after it.
+        """
+        return Deadline(self.seconds, at=self.at - seconds)
@@ -0,0 +1,58 @@
+"""
+In-process pub/sub for analysis job events.
+
+The pipeline publishes phase transitions and partial results here;
+SSE subscribers receive them without polling MongoDB.
+"""
+
+import asyncio
+import json
+
+
+# Events after which a job will not publish anything else
+TERMINAL_EVENTS = {"complete", "failed"}
+
+
+class JobEventBus:
+    """
+    Fan-out of job events to any number of subscribers per job_id.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: dict = {}
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(job_id)
+        if not queues:
+            return
+
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[job_id]
+
+    def publish(self, job_id: str, event: str, data: dict):
+        for queue in list(self._subscribers.get(job_id, ())):
+            try:
+                queue.put_nowait({"event": event, "data": data})
+            except asyncio.QueueFull:
+                # Slow consumer: drop the event rather than block the pipeline
+                print(f"⚠️ Dropped '{event}' event for job {job_id}")
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+def format_sse(event: str, data: dict) -> str:
+    """
+    Encode one Server-Sent Events message.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+job_event_bus = JobEventBus()
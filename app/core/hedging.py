@@ -0,0 +1,204 @@
+"""
+Hedged requests and adaptive timeouts for idempotent provider calls.
+
+Latencies of recent calls are kept per provider. When a call runs
+longer than a high percentile of those latencies, a second identical
+request is sent and whichever answers first wins. Timeouts follow the
+observed tail instead of a fixed worst case.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.config import settings
+from app.core.rate_limiter import rate_limiter
+
+
+class LatencyWindow:
+    """
+    Rolling window of recent successful call latencies (seconds).
+    """
+
+    def __init__(self, size: int):
+        self.samples = deque(maxlen=size)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.samples:
+            return None
+
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(p * len(ordered)))
+        return ordered[index]
+
+
+class RequestHedger:
+    """
+    Runs idempotent calls with hedging and adaptive timeouts.
+
+    - Every attempt (primary or hedge) takes its own rate limiter slot;
+      latency and timeout only cover the call itself, never the wait
+      for a token or a 429 backoff
+    - Hedge delay: HEDGE_PERCENTILE of the provider's latency window,
+      counted from when the primary got its slot. No hedge is sent while
+      the provider is backing off.
+    - Timeout: ADAPTIVE_TIMEOUT_PERCENTILE x multiplier, clamped between
+      the configured minimum and the caller's default
+    - Until HEDGE_MIN_SAMPLES latencies are known, calls run once with
+      the default timeout
+    """
+
+    def __init__(self, window_size: int, min_samples: int, limiter):
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.limiter = limiter
+
+        self._windows: dict = {}
+        self._counters: dict = {}
+
+    async def run(
+        self,
+        provider: str,
+        attempt: Callable[[], Awaitable[Any]],
+        default_timeout: float
+    ) -> Any:
+        """
+        Await `attempt()`, hedging it with a second call if it is slow.
+        `attempt` must be safe to call twice and must not take a rate
+        limiter slot itself.
+        """
+        counters = self._provider_counters(provider)
+        counters["calls"] += 1
+
+        timeout = self.timeout_for(provider, default_timeout)
+        hedge_delay = self.hedge_delay_for(provider) if settings.HEDGE_ENABLED else None
+
+        primary_sent = asyncio.Event()
+        primary = asyncio.ensure_future(self._attempt(provider, attempt, timeout, primary_sent))
+        tasks = {primary: "primary"}
+
+        try:
+            if hedge_delay is not None and hedge_delay < timeout:
+                # The hedge delay only starts once the primary is on the wire
+                sent = asyncio.ensure_future(primary_sent.wait())
+                await asyncio.wait({primary, sent}, return_when=asyncio.FIRST_COMPLETED)
+                sent.cancel()
+
+                if not primary.done():
+                    done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+                    if not done and not self.limiter.backing_off(provider):
+                        counters["hedged"] += 1
+                        hedge = asyncio.ensure_future(self._attempt(provider, attempt, timeout))
+                        tasks[hedge] = "hedge"
+
+            error = None
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    role = tasks.pop(task)
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+
+                    result, elapsed = task.result()
+                    self._window(provider).add(elapsed)
+                    counters[f"{role}_wins"] += 1
+
+                    # A primary that lost to its hedge took at least as long
+                    # as the hedge plus the delay; keep that so the tail stays visible
+                    if role == "hedge" and primary in tasks:
+                        self._window(provider).add(elapsed + hedge_delay)
+
+                    return result
+
+            if isinstance(error, asyncio.TimeoutError):
+                counters["timeouts"] += 1
+                print(f"⚠️ {provider} call timed out after {timeout:.1f}s")
+                raise asyncio.TimeoutError(f"{provider} call timed out after {timeout:.1f}s")
+
+            raise error
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def hedge_delay_for(self, provider: str) -> Optional[float]:
+        window = self._window(provider)
+        if len(window.samples) < self.min_samples:
+            return None
+        return window.percentile(settings.HEDGE_PERCENTILE)
+
+    def timeout_for(self, provider: str, default_timeout: float) -> float:
+        window = self._window(provider)
+        if len(window.samples) < self.min_samples:
+            return default_timeout
+
+        tail = window.percentile(settings.ADAPTIVE_TIMEOUT_PERCENTILE) * settings.ADAPTIVE_TIMEOUT_MULTIPLIER
+        return min(default_timeout, max(settings.ADAPTIVE_TIMEOUT_MIN_SECONDS, tail))
+
+    def stats(self) -> dict:
+        stats = {}
+
+        for provider, counters in self._counters.items():
+            window = self._window(provider)
+            hedged = counters["hedged"]
+
+            stats[provider] = {
+                **counters,
+                "hedge_win_rate": round(counters["hedge_wins"] / hedged, 3) if hedged else None,
+                "samples": len(window.samples),
+                "p50": self._round(window.percentile(0.5)),
+                "p90": self._round(window.percentile(0.9)),
+                "p99": self._round(window.percentile(0.99)),
+                "hedge_delay": self._round(self.hedge_delay_for(provider))
+            }
+
+        return stats
+
+    # --------------------------------------------------
+    # Internals
+    # --------------------------------------------------
+    async def _attempt(
+        self,
+        provider: str,
+        attempt: Callable[[], Awaitable[Any]],
+        timeout: float,
+        sent: Optional[asyncio.Event] = None
+    ) -> tuple:
+        """
+        One call: wait for a limiter slot, then time and bound the call.
+        """
+        async with self.limiter.limit(provider):
+            if sent is not None:
+                sent.set()
+
+            started = time.perf_counter()
+            result = await asyncio.wait_for(attempt(), timeout=timeout)
+            return result, time.perf_counter() - started
+
+    def _window(self, provider: str) -> LatencyWindow:
+        return self._windows.setdefault(provider, LatencyWindow(self.window_size))
+
+    def _provider_counters(self, provider: str) -> dict:
+        return self._counters.setdefault(provider, {
+            "calls": 0,
+            "hedged": 0,
+            "primary_wins": 0,
+            "hedge_wins": 0,
+            "timeouts": 0
+        })
+
+    def _round(self, value: Optional[float]) -> Optional[float]:
+        return round(value, 3) if value is not None else None
+
+
+request_hedger = RequestHedger(
+    window_size=settings.LATENCY_WINDOW_SIZE,
+    min_samples=settings.HEDGE_MIN_SAMPLES,
+    limiter=rate_limiter
+)
@@ -0,0 +1,78 @@
+"""
+Shared outbound HTTP client.
+
+One pooled, keep-alive httpx client for all provider calls, opened and
+closed with the app lifespan, so repeated calls to the same host reuse
+connections instead of paying for a new TCP + TLS handshake each time.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:  # Optional: HTTP/1.1 keep-alive only
+    HTTP2_AVAILABLE = False
+
+
+def build_client(**kwargs) -> httpx.AsyncClient:
+    """
+    New pooled client with the app's limits, timeouts and HTTP/2 setting.
+    """
+    return httpx.AsyncClient(
+        http2=settings.HTTP2_ENABLED and HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+        **kwargs
+    )
+
+
+class HttpClientManager:
+    """
+    Owns the shared client for the current event loop.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = None
+
+    async def start(self):
+        self.get()
+
+        if settings.HTTP2_ENABLED and not HTTP2_AVAILABLE:
+            print("⚠️ HTTP/2 requested but 'h2' is not installed, using HTTP/1.1 keep-alive")
+        print("✅ Shared HTTP client ready")
+
+    def get(self) -> httpx.AsyncClient:
+        # Pooled connections belong to one event loop (scripts may call
+        # asyncio.run more than once), so build a fresh client per loop
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = build_client()
+            self._loop = loop
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+http_clients = HttpClientManager()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Shared outbound client accessor.
+    """
+    return http_clients.get()
@@ -0,0 +1,274 @@
+"""
+Rate limiting and quota accounting for external APIs.
+
+Every provider (Tavily, Product Hunt, SerpAPI, Gemini) gets a token
+bucket for its request rate, a cap on concurrent calls and an optional
+daily quota shared by all workers through Mongo. Buckets and caps live
+in each process, so the configured account-wide limits are split evenly
+across PROVIDER_LIMIT_WORKERS processes.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.core.database import get_async_database
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+
+    Holds up to `capacity` tokens (the allowed burst) and refills at
+    `rate` tokens per second. `acquire()` waits only as long as needed
+    for a token; a rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+
+        self._acquired = 0
+        self._throttled = 0
+        self._waited_seconds = 0.0
+
+    async def acquire(self, tokens: int = 1):
+        if self.rate <= 0:
+            self._acquired += 1
+            return
+
+        started = time.monotonic()
+        throttled = False
+
+        while True:
+            self._refill()
+
+            # No await between the check and the take, so concurrent
+            # callers can never overdraw the bucket
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                break
+
+            throttled = True
+            await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+        self._acquired += 1
+        if throttled:
+            self._throttled += 1
+            self._waited_seconds += time.monotonic() - started
+
+    def stats(self) -> dict:
+        self._refill()
+        return {
+            "rate_per_second": self.rate,
+            "capacity": self.capacity,
+            "tokens": round(self._tokens, 2),
+            "acquired": self._acquired,
+            "throttled": self._throttled,
+            "waited_seconds": round(self._waited_seconds, 2)
+        }
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+def retry_after(response) -> Optional[float]:
+    """
+    Seconds from a 429 response's Retry-After header, if given as a number.
+    """
+    value = response.headers.get("retry-after", "")
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class QuotaExceededError(Exception):
+    """
+    Raised when a provider's daily quota is used up.
+    """
+
+
+class ProviderLimiter:
+    """
+    Limits for one external provider.
+
+    - Token bucket for request rate and burst
+    - Semaphore capping concurrent calls
+    - Optional daily quota, counted in Mongo so all workers share it
+    - Backoff window after the provider answers 429
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_concurrency: int, daily_quota: int = 0):
+        self.name = name
+        self.bucket = TokenBucket(rate=rate, capacity=burst)
+        self.max_concurrency = max(1, max_concurrency)
+        self.daily_quota = daily_quota
+
+        self._loop = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._blocked_until = 0.0
+
+        self._in_flight = 0
+        self._calls = 0
+        self._quota_rejections = 0
+        self._backoffs = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Wait until a call is allowed, then hold a concurrency slot for it.
+        Daily quota is only counted once the slot is granted, so a call
+        cancelled while still waiting costs nothing.
+        """
+        delay = self._blocked_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        async with self._get_semaphore():
+            await self.bucket.acquire()
+            await self._reserve_quota()
+
+            self._in_flight += 1
+            self._calls += 1
+            try:
+                yield
+            finally:
+                self._in_flight -= 1
+
+    def backoff(self, seconds: float):
+        """
+        Hold back new calls after the provider signalled throttling.
+        """
+        self._backoffs += 1
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        print(f"⚠️ {self.name} rate limited, backing off {seconds:.0f}s")
+
+    def backing_off(self) -> bool:
+        return self._blocked_until > time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self._calls,
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "daily_quota": self.daily_quota,
+            "quota_rejections": self._quota_rejections,
+            "backoffs": self._backoffs,
+            "bucket": self.bucket.stats()
+        }
+
+    # --------------------------------------------------
+    # Internals
+    # --------------------------------------------------
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop (scripts may call asyncio.run twice)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _reserve_quota(self):
+        if self.daily_quota <= 0:
+            return
+
+        usage = get_async_database()["provider_usage"]
+        key = {"_id": f"{self.name}:{datetime.utcnow():%Y-%m-%d}"}
+
+        try:
+            doc = await usage.find_one_and_update(
+                key,
+                {"$inc": {"count": 1}, "$setOnInsert": {"provider": self.name, "created_at": datetime.utcnow()}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except Exception as e:
+            # Quota accounting must never take the provider down with it
+            print(f"⚠️ Quota accounting for {self.name} failed: {e}")
+            return
+
+        if doc["count"] > self.daily_quota:
+            self._quota_rejections += 1
+            await usage.update_one(key, {"$inc": {"count": -1}})
+            raise QuotaExceededError(f"Daily {self.name} quota of {self.daily_quota} calls reached")
+
+
+class RateLimiter:
+    """
+    Registry of provider limiters. Every external call goes through:
+
+        async with rate_limiter.limit("tavily"):
+            ...
+
+    `providers` holds account-wide limits; this process enforces a
+    1/`workers` share of rate, burst and concurrency.
+    """
+
+    def __init__(self, providers: dict, workers: int = 1):
+        self.workers = max(1, workers)
+        self.providers = {
+            name: ProviderLimiter(name, **self._share(limits))
+            for name, limits in providers.items()
+        }
+
+    def limit(self, provider: str):
+        return self.providers[provider].slot()
+
+    def backoff(self, provider: str, seconds: Optional[float] = None):
+        self.providers[provider].backoff(seconds or settings.PROVIDER_BACKOFF_SECONDS)
+
+    def backing_off(self, provider: str) -> bool:
+        return self.providers[provider].backing_off()
+
+    def stats(self) -> dict:
+        return {name: limiter.stats() for name, limiter in self.providers.items()}
+
+    # --------------------------------------------------
+    # Internals
+    # --------------------------------------------------
+    def _share(self, limits: dict) -> dict:
+        return {
+            **limits,
+            "rate": limits["rate"] / self.workers,
+            "burst": max(1, limits["burst"] // self.workers),
+            "max_concurrency": max(1, limits["max_concurrency"] // self.workers)
+        }
+
+
+rate_limiter = RateLimiter({
+    "tavily": {
+        "rate": settings.TAVILY_RATE_PER_SECOND,
+        "burst": settings.TAVILY_BURST,
+        "max_concurrency": settings.TAVILY_MAX_CONCURRENCY,
+        "daily_quota": settings.TAVILY_DAILY_QUOTA
+    },
+    "producthunt": {
+        "rate": settings.PRODUCTHUNT_RATE_PER_SECOND,
+        "burst": settings.PRODUCTHUNT_BURST,
+        "max_concurrency": settings.PRODUCTHUNT_MAX_CONCURRENCY,
+        "daily_quota": settings.PRODUCTHUNT_DAILY_QUOTA
+    },
+    "serpapi": {
+        "rate": settings.SERPAPI_RATE_PER_SECOND,
+        "burst": settings.SERPAPI_BURST,
+        "max_concurrency": settings.SERPAPI_MAX_CONCURRENCY,
+        "daily_quota": settings.SERPAPI_DAILY_QUOTA
+    },
+    "gemini": {
+        "rate": settings.GEMINI_RATE_PER_SECOND,
+        "burst": settings.GEMINI_BURST,
+        "max_concurrency": settings.GEMINI_MAX_CONCURRENCY,
+        "daily_quota": settings.GEMINI_DAILY_QUOTA
+    },
+}, workers=settings.PROVIDER_LIMIT_WORKERS)
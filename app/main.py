@@ -4,21 +4,53 @@ Main FastAPI application.
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Optional
+import asyncio
 
+from app.core.cache import response_cache
 from app.core.config import settings
-from app.core.database import mongodb, get_database
+from app.core.database import mongodb, get_database, get_async_database
+from app.core.events import job_event_bus, format_sse, TERMINAL_EVENTS
+from app.core.hedging import request_hedger
+from app.core.http_client import http_clients
+from app.core.rate_limiter import rate_limiter
 from app.models.requests import AnalyzeRequest
 from app.services.analysis_service import analysis_service
+from app.services.browser_pool import browser_pool
+from app.services.playwright_service import playwright_service
+from app.services.job_queue import job_queue, JobQueueFullError
+from app.services.job_state import job_state
+from app.services.raw_store import raw_store
+from app.services.result_cache import result_cache
+from app.services.singleflight import singleflight
+from app.services.tavily_service import tavily_service
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 Starting Waypoint API...")
-    mongodb.connect()
+    await mongodb.connect_async()
+    try:
+        await mongodb.ensure_indexes()
+    except Exception as e:
+        print(f"⚠️ Could not ensure MongoDB indexes: {e}")
+    await http_clients.start()
+    await job_state.start()
+    await job_queue.start()
+    await browser_pool.start()
     yield
     print("👋 Shutting down Waypoint API...")
+    await job_queue.stop(
+        grace_seconds=settings.JOB_SHUTDOWN_GRACE_SECONDS,
+        on_abandoned=analysis_service.mark_failed
+    )
+    await job_state.stop()
+    await browser_pool.stop()
+    await tavily_service.close()
+    await http_clients.close()
     mongodb.close()
 
 
@@ -74,11 +106,90 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/stats")
+def get_stats():
+    """
+    Runtime counters for caches and background workers.
+    """
+    return {
+        "response_cache": response_cache.stats(),
+        "job_queue": job_queue.stats(),
+        "job_state": job_state.stats(),
+        "singleflight": singleflight.stats(),
+        "stream_subscribers": job_event_bus.subscriber_count(),
+        "browser_pool": browser_pool.stats(),
+        "scraper": playwright_service.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "hedging": request_hedger.stats()
+    }
+
+
 @app.post("/analyze")
 async def analyze_idea(request: AnalyzeRequest):
     """
     Analyze a product idea.
+
+    With `background: true` the job is queued and its job_id returned
+    immediately; poll /results/{job_id} for progress.
+
+    Repeated ideas are served from the result cache unless
+    `force_refresh` is set.
     """
+    if settings.RESULT_CACHE_ENABLED and not request.force_refresh:
+        cached = await result_cache.serve(
+            product_idea=request.product_idea,
+            tier=request.tier,
+            email=request.email
+        )
+        if cached:
+            return {
+                "success": True,
+                "job_id": cached["job_id"],
+                "cached": True,
+                "data": cached
+            }
+
+    if request.background:
+        try:
+            job_id = await analysis_service.create_job(
+                product_idea=request.product_idea,
+                tier=request.tier,
+                email=request.email
+            )
+
+            if settings.SINGLEFLIGHT_ENABLED:
+                leader_job_id = await singleflight.join(request.product_idea, request.tier, job_id)
+                if leader_job_id:
+                    return {
+                        "success": True,
+                        "job_id": job_id,
+                        "status": "queued",
+                        "deduplicated": True,
+                        "message": "Joined a running analysis"
+                    }
+
+            job_queue.submit(
+                job_id,
+                analysis_service.run_analysis,
+                request.product_idea,
+                request.tier
+            )
+
+            return {
+                "success": True,
+                "job_id": job_id,
+                "status": "queued",
+                "message": "Analysis started"
+            }
+
+        except JobQueueFullError as e:
+            await analysis_service.mark_failed(job_id, str(e))
+            raise HTTPException(status_code=503, detail=str(e))
+
+        except Exception as e:
+            print(f"❌ API Error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
     try:
         result = await analysis_service.analyze_product(
             product_idea=request.product_idea,
@@ -98,21 +209,173 @@ async def analyze_idea(request: AnalyzeRequest):
 
 
 @app.get("/results/{job_id}")
-def get_results(job_id: str):
+async def get_results(
+    job_id: str,
+    fields: Optional[str] = None,
+    include: Optional[str] = None
+):
+    """
+    Fetch a job record.
+
+    Pass a comma-separated `fields` list (e.g. ?fields=status,progress)
+    to return only those fields instead of the full document.
+    Raw market data is only loaded with ?include=raw.
+    """
     try:
-        db = get_database()
-        analysis = db["analyses"].find_one({"job_id": job_id})
+        include_raw = "raw" in (include or "").split(",")
+
+        db = get_async_database()
+        projection = results_projection(fields)
+
+        # Older jobs still carry raw_market_data inline
+        query_projection = projection
+        if projection is None and not include_raw:
+            query_projection = {"raw_market_data": 0}
+
+        analysis = await db["analyses"].find_one({"job_id": job_id}, projection=query_projection)
 
         if not analysis:
             return {"success": False, "message": "Analysis not found"}
 
-        analysis["_id"] = str(analysis["_id"])
+        analysis = job_state.overlay(analysis, projection)
+        analysis = await singleflight.mirror_leader(analysis, projection)
+        analysis = await result_cache.resolve(analysis, projection)
+
+        if include_raw:
+            raw = await raw_store.load(analysis.get("source_job_id") or job_id)
+            if raw is not None:
+                analysis["raw_market_data"] = raw
+
+        if "_id" in analysis:
+            analysis["_id"] = str(analysis["_id"])
         return {"success": True, "data": analysis}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def results_projection(fields: Optional[str]) -> Optional[dict]:
+    """
+    Build a Mongo projection from a comma-separated field list.
+    job_id, status, source_job_id and leader_job_id are always included.
+    """
+    if not fields:
+        return None
+
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    names |= {"job_id", "status", "source_job_id", "leader_job_id"}
+
+    projection = {name: 1 for name in names}
+    if "_id" not in names:
+        projection["_id"] = 0
+    return projection
+
+
+@app.get("/results/{job_id}/stream")
+async def stream_results(job_id: str):
+    """
+    Server-Sent Events stream of a job's progress and partial results.
+
+    Sends a snapshot of the current state first, then pushes events
+    published by the pipeline until the job completes or fails.
+    """
+    # Jobs that joined a running analysis follow the leader's events
+    job_id = await singleflight.stream_target(job_id)
+
+    # Subscribe before reading the snapshot so no event is missed in between
+    queue = job_event_bus.subscribe(job_id)
+
+    db = get_async_database()
+    snapshot = await db["analyses"].find_one(
+        {"job_id": job_id},
+        projection={"_id": 0, "raw_market_data": 0, "base_analysis": 0}
+    )
+
+    if not snapshot:
+        job_event_bus.unsubscribe(job_id, queue)
+        raise HTTPException(status_code=404, detail="Analysis not found")
+
+    snapshot = job_state.overlay(snapshot)
+
+    async def event_stream():
+        try:
+            status = snapshot.get("status")
+
+            if status in TERMINAL_EVENTS:
+                yield await terminal_event(snapshot)
+                return
+
+            yield format_sse("snapshot", {
+                "status": status,
+                "progress": snapshot.get("progress"),
+                "phase": snapshot.get("phase")
+            })
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(),
+                        timeout=settings.SSE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # The job may have finished where our bus cannot see it
+                    # (another worker, or a job abandoned on shutdown)
+                    finished = await read_finished_job(job_id)
+                    if finished:
+                        yield await terminal_event(finished)
+                        return
+
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+
+                yield format_sse(message["event"], message["data"])
+
+                if message["event"] in TERMINAL_EVENTS:
+                    return
+
+        finally:
+            job_event_bus.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def read_finished_job(job_id: str) -> Optional[dict]:
+    """
+    The job record if it reached a terminal status, else None.
+    """
+    doc = await get_async_database()["analyses"].find_one(
+        {"job_id": job_id},
+        projection={"_id": 0, "status": 1}
+    )
+    if not doc or job_state.overlay(doc).get("status") not in TERMINAL_EVENTS:
+        return None
+
+    doc = await get_async_database()["analyses"].find_one(
+        {"job_id": job_id},
+        projection={"_id": 0, "raw_market_data": 0, "base_analysis": 0}
+    )
+    return job_state.overlay(doc) if doc else None
+
+
+async def terminal_event(doc: dict) -> str:
+    """
+    SSE message for a job that already completed or failed.
+    """
+    final = await result_cache.resolve(doc, {"analysis": 1, "partial": 1, "missing_sources": 1})
+    return format_sse(final["status"], {
+        "status": final["status"],
+        "progress": final.get("progress"),
+        "analysis": final.get("analysis"),
+        "missing_sources": final.get("missing_sources", []),
+        "error": final.get("error")
+    })
+
+
 @app.post("/test-db")
 def test_database():
     try:
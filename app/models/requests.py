@@ -27,6 +27,16 @@ class AnalyzeRequest(BaseModel):
         description="User email"
     )
 
+    background: bool = Field(
+        default=False,
+        description="Return the job_id immediately and run the analysis in the background"
+    )
+
+    force_refresh: bool = Field(
+        default=False,
+        description="Skip the result cache and run a fresh analysis"
+    )
+
     @validator("product_idea")
     def validate_idea(cls, v):
         if not v.strip():
@@ -2,8 +2,17 @@
 
 from app.services.gemini_service import gemini_service
 from app.services.data_collector import data_collector
-from app.core.database import get_database
+from app.services.job_state import job_state
+from app.services.raw_store import raw_store
+from app.services.singleflight import singleflight
+from app.core.config import settings
+from app.core.database import get_async_database
+from app.core.deadline import Deadline
+from app.core.events import job_event_bus
+from app.utils.fingerprint import idea_fingerprint
 from datetime import datetime
+from typing import Optional
+import asyncio
 import uuid
 
 
@@ -18,79 +27,172 @@ class AnalysisService:
         tier: str,        # "prelaunch" | "postlaunch"
         email: str
     ) -> dict:
+        """
+        Run the full pipeline inline and return the finished analysis.
+        Joins an identical analysis instead if one is already running.
+        """
+        job_id = await self.create_job(product_idea, tier, email)
+
+        if settings.SINGLEFLIGHT_ENABLED:
+            leader_job_id = await singleflight.join(product_idea, tier, job_id)
+            if leader_job_id:
+                return await singleflight.wait(job_id, leader_job_id)
+
+        return await self.run_analysis(job_id, product_idea, tier)
 
-        db = get_database()
+    async def create_job(
+        self,
+        product_idea: str,
+        tier: str,
+        email: str
+    ) -> str:
+        """
+        Insert a queued job record and return its job_id.
+        """
+        db = get_async_database()
         job_id = str(uuid.uuid4())
 
+        await db["analyses"].insert_one({
+            "job_id": job_id,
+            "email": email,
+            "product_idea": product_idea,
+            "tier": tier,
+            "idea_fingerprint": idea_fingerprint(product_idea, tier),
+            "status": "queued",
+            "progress": 0,
+            "created_at": datetime.utcnow()
+        })
+
+        return job_id
+
+    async def run_analysis(self, job_id: str, product_idea: str, tier: str) -> dict:
+        """
+        Run the analysis pipeline for an existing job record.
+        Used directly by background workers.
+
+        The whole run is bounded by the tier's deadline. Collection stops
+        early enough to leave the Gemini stages their reserve. Sources that
+        contributed nothing are listed in `missing_sources`; the result is
+        `partial` when the deadline cut any of them off.
+        """
+        deadline = Deadline.for_tier(tier)
+
         print(f"\n🚀 Starting analysis: {job_id}")
         print(f"📝 Idea: {product_idea}")
-        print(f"👤 User type: {tier}\n")
+        print(f"👤 User type: {tier}")
+        print(f"⏳ Deadline: {deadline.seconds:.0f}s\n")
 
         # --------------------------------------------------
-        # 1️⃣ Create DB record
+        # 1️⃣ Mark job as running
         # --------------------------------------------------
-        db["analyses"].insert_one({
-            "job_id": job_id,
-            "email": email,
-            "product_idea": product_idea,
-            "tier": tier,
+        self._set_progress(job_id, 10, "started", {
             "status": "processing",
-            "progress": 10,
-            "created_at": datetime.utcnow()
+            "started_at": datetime.utcnow()
         })
 
+        # Handed to waiting duplicates however the run ends (even cancelled)
+        outcome = {"status": "failed", "error": "Analysis was cancelled"}
+
         try:
             # --------------------------------------------------
             # 2️⃣ Collect market evidence
             # --------------------------------------------------
             print("🔍 Collecting market data...")
-            db["analyses"].update_one(
-                {"job_id": job_id},
-                {"$set": {"progress": 30}}
+            self._set_progress(job_id, 30, "collecting")
+            market_data = await data_collector.collect_market_data(
+                product_idea,
+                deadline=deadline.reserve(settings.ANALYSIS_LLM_RESERVE_SECONDS)
             )
-            market_data = await data_collector.collect_market_data(product_idea)
+            source_status = market_data.get("source_status", {})
+            missing_sources = market_data.get("missing_sources", [])
+
+            # Partial = the deadline cut sources off. A source that errors
+            # (e.g. a bad API key) fails the same way on every run.
+            partial = "deadline" in source_status.values()
+
+            job_event_bus.publish(job_id, "competitors", {
+                "competitors": market_data.get("competitors", [])
+            })
 
             # --------------------------------------------------
             # 3️⃣ Compress evidence for Gemini
             # --------------------------------------------------
             print("📊 Summarizing evidence...")
-            db["analyses"].update_one(
-                {"job_id": job_id},
-                {"$set": {"progress": 50}}
-            )
+            self._set_progress(job_id, 50, "summarizing")
             evidence = self._summarize_evidence(market_data)
 
             # --------------------------------------------------
             # 4️⃣ Base Strategic Analysis (Gemini)
             # --------------------------------------------------
             print("🧠 Running base analysis...")
-            db["analyses"].update_one(
-                {"job_id": job_id},
-                {"$set": {"progress": 70}}
-            )
-            base_analysis = self._run_gemini_analysis(
+            self._set_progress(job_id, 70, "base_analysis")
+
+            on_section = None
+            if settings.GEMINI_STREAM_SECTIONS:
+                on_section = lambda section, content: self._save_section(job_id, section, content)
+
+            base_task = asyncio.create_task(self._run_gemini_analysis(
                 product_idea=product_idea,
                 tier=tier,
                 evidence=evidence
-            )
-
-            if base_analysis is None:
-                raise Exception("Gemini returned invalid structured output")
+            ))
+
+            # Sharded expansion starts right away: evidence-only shards
+            # overlap with stage 1, the rest wait for base_task
+            expansion_task = None
+            if settings.DASHBOARD_SHARD_COUNT > 1:
+                expansion_task = asyncio.create_task(
+                    gemini_service.expand_dashboard_analysis_sharded(
+                        collected_data=market_data,
+                        base_analysis=base_task,
+                        on_section=on_section
+                    )
+                )
+
+            try:
+                base_analysis = await asyncio.wait_for(base_task, timeout=deadline.remaining())
+
+                if base_analysis is None:
+                    raise Exception("Gemini returned invalid structured output")
+
+            except asyncio.TimeoutError:
+                if expansion_task:
+                    expansion_task.cancel()
+                raise Exception(f"Analysis exceeded its {deadline.seconds:.0f}s deadline during base analysis")
+
+            except Exception:
+                if expansion_task:
+                    expansion_task.cancel()
+                raise
+
+            job_event_bus.publish(job_id, "base_analysis", {
+                "base_analysis": base_analysis
+            })
 
             # --------------------------------------------------
             # 5️⃣ NEW: Expand into dashboard sections
             # --------------------------------------------------
             print("📈 Expanding dashboard analysis...")
-            db["analyses"].update_one(
-                {"job_id": job_id},
-                {"$set": {"progress": 90}}
-            )
-            
-            # No await needed - this is a synchronous method
-            dashboard_analysis = gemini_service.expand_dashboard_analysis(
-                collected_data=market_data,
-                base_analysis=base_analysis
-            )
+            self._set_progress(job_id, 90, "expanding")
+
+            if expansion_task:
+                expansion = expansion_task
+            elif on_section:
+                expansion = gemini_service.expand_dashboard_analysis_stream(
+                    collected_data=market_data,
+                    base_analysis=base_analysis,
+                    on_section=on_section
+                )
+            else:
+                expansion = gemini_service.expand_dashboard_analysis_async(
+                    collected_data=market_data,
+                    base_analysis=base_analysis
+                )
+
+            try:
+                dashboard_analysis = await asyncio.wait_for(expansion, timeout=deadline.remaining())
+            except asyncio.TimeoutError:
+                raise Exception(f"Analysis exceeded its {deadline.seconds:.0f}s deadline during dashboard expansion")
 
             if dashboard_analysis is None:
                 raise Exception("Dashboard expansion returned invalid output")
@@ -98,63 +200,113 @@ class AnalysisService:
             # --------------------------------------------------
             # 6️⃣ Persist result
             # --------------------------------------------------
-            db["analyses"].update_one(
-                {"job_id": job_id},
-                {
-                    "$set": {
-                        "status": "complete",
-                        "progress": 100,
-                        "raw_market_data": market_data,
-                        "base_analysis": base_analysis,
-                        "analysis": dashboard_analysis,
-                        "completed_at": datetime.utcnow()
-                    }
-                }
-            )
+            # Raw evidence lives in its own collection, loaded on demand
+            try:
+                await raw_store.save(job_id, market_data)
+            except Exception as e:
+                print(f"⚠️ Could not store raw market data: {e}")
+
+            await job_state.finish(job_id, {
+                "status": "complete",
+                "progress": 100,
+                "phase": "complete",
+                "base_analysis": base_analysis,
+                "analysis": dashboard_analysis,
+                "partial": partial,
+                "missing_sources": missing_sources,
+                "source_status": source_status,
+                "completed_at": datetime.utcnow()
+            })
+
+            job_event_bus.publish(job_id, "complete", {
+                "status": "complete",
+                "progress": 100,
+                "analysis": dashboard_analysis,
+                "missing_sources": missing_sources
+            })
+
+            outcome = {
+                "status": "complete",
+                "analysis": dashboard_analysis,
+                "partial": partial,
+                "missing_sources": missing_sources
+            }
 
             print("✅ Analysis completed\n")
 
             return {
                 "job_id": job_id,
                 "status": "complete",
+                "partial": partial,
+                "missing_sources": missing_sources,
                 "analysis": dashboard_analysis
             }
 
         except Exception as e:
             print(f"❌ Analysis failed: {str(e)}")
-            db["analyses"].update_one(
-                {"job_id": job_id},
-                {
-                    "$set": {
-                        "status": "failed",
-                        "error": str(e),
-                        "completed_at": datetime.utcnow()
-                    }
-                }
-            )
+            outcome = {"status": "failed", "error": str(e)}
+            await self.mark_failed(job_id, str(e))
             raise
 
-    # --------------------------------------------------
-    # Alternative method name for compatibility
-    # --------------------------------------------------
-    async def run_analysis(self, job_id: str, idea: str, user_type: str) -> dict:
+        finally:
+            # No-op if mark_failed already released
+            await singleflight.release(job_id, outcome)
+
+    def _set_progress(
+        self,
+        job_id: str,
+        progress: int,
+        phase: str,
+        extra: Optional[dict] = None
+    ):
+        """
+        Record a progress checkpoint and publish it to stream subscribers.
+        Persisted by the job state writer on its next flush.
+        """
+        job_state.update(job_id, {"progress": progress, "phase": phase, **(extra or {})})
+
+        job_event_bus.publish(job_id, "progress", {
+            "status": "processing",
+            "progress": progress,
+            "phase": phase
+        })
+
+    async def _save_section(self, job_id: str, section: str, content):
         """
-        Alternative interface for the analysis pipeline.
-        Maps to analyze_product but uses pre-existing job_id.
+        Persist and publish one dashboard section as soon as it is generated.
         """
-        db = get_database()
-        
-        # Find existing job record to get email
-        job = db["analyses"].find_one({"job_id": job_id})
-        email = job.get("email", "unknown@example.com") if job else "unknown@example.com"
-        
-        # Run the full analysis
-        return await self.analyze_product(
-            product_idea=idea,
-            tier=user_type,
-            email=email
+        db = get_async_database()
+        await db["analyses"].update_one(
+            {"job_id": job_id},
+            {"$set": {f"analysis.{section}": content}}
         )
 
+        job_event_bus.publish(job_id, "section", {
+            "section": section,
+            "content": content
+        })
+
+    async def mark_failed(self, job_id: str, error: str):
+        """
+        Record a terminal failure on the job record.
+        Duplicates waiting on the job are released even if the write fails.
+        """
+        try:
+            await job_state.finish(job_id, {
+                "status": "failed",
+                "phase": "failed",
+                "error": error,
+                "completed_at": datetime.utcnow()
+            })
+
+        finally:
+            job_event_bus.publish(job_id, "failed", {
+                "status": "failed",
+                "error": error
+            })
+
+            await singleflight.release(job_id, {"status": "failed", "error": error})
+
     # --------------------------------------------------
     # Evidence summarizer (deterministic, no AI)
     # --------------------------------------------------
@@ -186,7 +338,7 @@ class AnalysisService:
     # --------------------------------------------------
     # Gemini reasoning
     # --------------------------------------------------
-    def _run_gemini_analysis(
+    async def _run_gemini_analysis(
         self,
         product_idea: str,
         tier: str,
@@ -265,7 +417,7 @@ INSTRUCTIONS:
             "overall_confidence": "float"
         }
 
-        return gemini_service.generate_structured(prompt, response_schema)
+        return await gemini_service.generate_structured_async(prompt, response_schema)
 
 
 analysis_service = AnalysisService()
\ No newline at end of file
@@ -0,0 +1,287 @@
+# app/services/browser_pool.py
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Route
+
+from app.core.config import settings
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Lean mode: resource types we never need to extract text
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "texttrack", "manifest"}
+
+# Lean mode: analytics, ads and tracking hosts (suffix match)
+BLOCKED_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "facebook.net",
+    "connect.facebook.com",
+    "hotjar.com",
+    "segment.com",
+    "segment.io",
+    "mixpanel.com",
+    "amplitude.com",
+    "heapanalytics.com",
+    "fullstory.com",
+    "clarity.ms",
+    "intercom.io",
+    "intercomcdn.com",
+    "hs-analytics.net",
+    "hs-scripts.com",
+    "licdn.com",
+    "ads-twitter.com",
+    "analytics.tiktok.com",
+    "optimizely.com",
+    "newrelic.com",
+    "nr-data.net",
+)
+
+
+class BrowserPool:
+    """
+    Long-lived headless Chromium shared by all scrapes.
+
+    - One browser process, launched once (lazily or at app startup)
+    - Up to `max_contexts` browser contexts, pages spread across them
+    - At most `max_pages` pages in use at once (semaphore)
+    - Pages are recycled after use and closed after `page_max_uses`
+    - A crashed or disconnected browser is relaunched on next use
+    - In lean mode, heavy resources and trackers are blocked per context
+    """
+
+    def __init__(self, max_contexts: int, max_pages: int, page_max_uses: int):
+        self.max_contexts = max(1, max_contexts)
+        self.max_pages = max(1, max_pages)
+        self.page_max_uses = max(1, page_max_uses)
+
+        self._loop = None
+        self._playwright = None
+        self._browser: Optional[Browser] = None
+        self._contexts: list = []
+        self._lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self._launches = 0
+        self._pages_created = 0
+        self._pages_reused = 0
+        self._requests_blocked = 0
+
+    async def start(self):
+        """
+        Called from the app lifespan. Launches Chromium up front when
+        BROWSER_POOL_PRELAUNCH is set, otherwise on first use.
+        """
+        self._bind_loop()
+
+        if not settings.BROWSER_POOL_PRELAUNCH:
+            return
+
+        try:
+            await self._ensure_browser()
+        except Exception as e:
+            print(f"⚠️ Browser pool prelaunch failed, will retry on demand: {e}")
+
+    async def stop(self):
+        if self._lock is None:
+            return
+
+        async with self._lock:
+            await self._close_browser()
+
+            if self._playwright:
+                await self._playwright.stop()
+                self._playwright = None
+
+        print("👋 Browser pool closed")
+
+    @asynccontextmanager
+    async def page(self):
+        """
+        Borrow a page from the pool.
+
+        Usage:
+            async with browser_pool.page() as page:
+                await page.goto(url)
+        """
+        self._bind_loop()
+
+        async with self._semaphore:
+            slot = await self._acquire_slot()
+            page, uses = await self._take_page(slot)
+            healthy = True
+
+            try:
+                yield page
+
+            except BaseException:
+                # Errors and cancellations (e.g. scrape deadlines) may leave
+                # the page mid-navigation, so it is closed instead of reused
+                healthy = False
+                raise
+
+            finally:
+                await self._release_page(slot, page, uses + 1, healthy)
+
+    def stats(self) -> dict:
+        return {
+            "browser_running": self._browser is not None and self._browser.is_connected(),
+            "launches": self._launches,
+            "contexts": len(self._contexts),
+            "pages_in_use": sum(slot["in_use"] for slot in self._contexts),
+            "pages_idle": sum(len(slot["idle"]) for slot in self._contexts),
+            "pages_created": self._pages_created,
+            "pages_reused": self._pages_reused,
+            "lean_mode": settings.SCRAPE_LEAN_MODE,
+            "requests_blocked": self._requests_blocked
+        }
+
+    # --------------------------------------------------
+    # Internals
+    # --------------------------------------------------
+    def _bind_loop(self):
+        """
+        Playwright objects and asyncio primitives belong to one event
+        loop. Start fresh if we are now running on a different one
+        (e.g. scripts calling asyncio.run more than once).
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        self._loop = loop
+        self._playwright = None
+        self._browser = None
+        self._contexts = []
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(self.max_pages)
+
+    async def _ensure_browser(self) -> Browser:
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+
+            # Crash recovery: drop anything tied to the dead browser
+            await self._close_browser()
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._browser.on("disconnected", self._on_disconnected)
+            self._launches += 1
+            print(f"✅ Chromium launched for browser pool (launch #{self._launches})")
+
+            return self._browser
+
+    async def _acquire_slot(self) -> dict:
+        browser = await self._ensure_browser()
+
+        async with self._lock:
+            # Prefer a context with an idle page, then the least loaded one
+            for slot in self._contexts:
+                if slot["idle"]:
+                    return slot
+
+            if len(self._contexts) < self.max_contexts:
+                context = await self._new_context(browser)
+                slot = {"context": context, "idle": [], "in_use": 0}
+                self._contexts.append(slot)
+                return slot
+
+            return min(self._contexts, key=lambda s: s["in_use"])
+
+    async def _new_context(self, browser: Browser) -> BrowserContext:
+        context = await browser.new_context(user_agent=USER_AGENT)
+
+        if settings.SCRAPE_LEAN_MODE:
+            await context.route("**/*", self._route_request)
+
+        return context
+
+    async def _route_request(self, route: Route):
+        request = route.request
+
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or self._is_blocked_host(request.url):
+            self._requests_blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _is_blocked_host(self, url: str) -> bool:
+        host = urlparse(url).hostname or ""
+        return any(host == domain or host.endswith("." + domain) for domain in BLOCKED_DOMAINS)
+
+    async def _take_page(self, slot: dict) -> tuple:
+        slot["in_use"] += 1
+
+        while slot["idle"]:
+            page, uses = slot["idle"].pop()
+            if not page.is_closed():
+                self._pages_reused += 1
+                return page, uses
+
+        try:
+            page: Page = await slot["context"].new_page()
+        except Exception:
+            slot["in_use"] -= 1
+            raise
+
+        page.on("crash", lambda p: asyncio.ensure_future(p.close()))
+        self._pages_created += 1
+        return page, 0
+
+    async def _release_page(self, slot: dict, page: Page, uses: int, healthy: bool):
+        slot["in_use"] -= 1
+
+        if slot not in self._contexts or page.is_closed():
+            return
+
+        if not healthy or uses >= self.page_max_uses:
+            await self._safe_close(page)
+            return
+
+        try:
+            # Reset page state before handing it to the next scrape
+            await page.goto("about:blank")
+            slot["idle"].append((page, uses))
+        except Exception:
+            await self._safe_close(page)
+
+    def _on_disconnected(self, browser: Browser):
+        print("⚠️ Chromium disconnected, browser pool will relaunch on next use")
+        if self._browser is browser:
+            self._browser = None
+            self._contexts = []
+
+    async def _close_browser(self):
+        contexts, self._contexts = self._contexts, []
+        for slot in contexts:
+            await self._safe_close(slot["context"])
+
+        if self._browser is not None:
+            await self._safe_close(self._browser)
+            self._browser = None
+
+    async def _safe_close(self, target):
+        try:
+            await target.close()
+        except Exception:
+            pass
+
+
+browser_pool = BrowserPool(
+    max_contexts=settings.BROWSER_POOL_MAX_CONTEXTS,
+    max_pages=settings.BROWSER_POOL_MAX_PAGES,
+    page_max_uses=settings.BROWSER_POOL_PAGE_MAX_USES
+)
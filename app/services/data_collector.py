@@ -1,16 +1,45 @@
 # app/services/data_collector.py
 
+import asyncio
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.deadline import Deadline
+from app.services.playwright_service import playwright_service
 from app.services.producthunt_service import producthunt_service
+from app.services.serp_trends_service import serp_trends_service
 from app.services.tavily_service import tavily_service
+from app.utils.fingerprint import url_fingerprint
 from app.utils.market_classifier import classify_market_signal
 
 
 class DataCollector:
+    """
+    Concurrent market data collection engine.
+
+    Every source is fanned out at the same time and bounded by its own
+    timeout budget. Results are merged afterwards in a fixed order, so the
+    output does not depend on which source happened to answer first.
+
+    With a deadline, budgets are capped by the time left: sources still
+    running when it passes are cancelled and listed in `missing_sources`.
+    """
 
     def __init__(self):
-        pass
+        # Per-source timeout budget (seconds)
+        self.source_timeouts = {
+            "competitors": settings.COLLECTOR_TAVILY_TIMEOUT,
+            "producthunt": settings.COLLECTOR_PRODUCTHUNT_TIMEOUT,
+            "pain_points": settings.COLLECTOR_TAVILY_TIMEOUT,
+            "communities": settings.COLLECTOR_TAVILY_TIMEOUT,
+            "alternatives": settings.COLLECTOR_TAVILY_TIMEOUT,
+            "search_trends": settings.COLLECTOR_SERPAPI_TIMEOUT,
+            # Waits for competitors, then scrapes within its own deadline
+            "enrichment": settings.COLLECTOR_TAVILY_TIMEOUT + settings.SCRAPE_DEADLINE_SECONDS,
+        }
 
-    async def collect_market_data(self, product_idea: str):
+    async def collect_market_data(self, product_idea: str, deadline: Optional[Deadline] = None):
         print(f"\n🚀 Collecting market data for: {product_idea}\n")
 
         result = {
@@ -23,18 +52,165 @@ class DataCollector:
                 "communities": [],
                 "demand_signals": [],
                 "general_insight": []
-            }
+            },
+            "source_status": {},
+            "missing_sources": []
         }
 
         # --------------------------------------------------
-        # 1️⃣ Tavily → COMPETITORS (Primary Source)
+        # 1️⃣ Fan out every source concurrently
         # --------------------------------------------------
         print("=" * 50)
-        print("🔍 Phase 1: Searching for competitors...")
+        print("🔍 Fetching competitors, Product Hunt, market signals and search trends concurrently...")
         print("=" * 50)
-        
-        tavily_competitors = await tavily_service.search_competitors(product_idea, max_results=15)
 
+        pain_query = f"{product_idea} problems pain points complaints issues challenges"
+        community_query = f"{product_idea} community forum reddit discord slack groups"
+        alternatives_query = f"{product_idea} alternatives solutions tools software"
+
+        # Competitors feed both the merge and the enrichment scrape
+        competitors_task = asyncio.ensure_future(
+            tavily_service.search_competitors(product_idea, max_results=15)
+        )
+
+        sources = {
+            "competitors": competitors_task,
+            "producthunt": self._collect_producthunt(product_idea),
+            "pain_points": tavily_service.search_market_signals(pain_query, max_results=8),
+            "communities": tavily_service.search_market_signals(community_query, max_results=5),
+            "alternatives": tavily_service.search_market_signals(alternatives_query, max_results=8),
+            "search_trends": self._collect_search_trends(product_idea),
+            "enrichment": self._enrich_competitors(competitors_task),
+        }
+
+        started = time.perf_counter()
+        fetched = await asyncio.gather(*(
+            self._fetch_source(name, coro, deadline) for name, coro in sources.items()
+        ))
+        collected = dict(zip(sources.keys(), fetched))
+
+        for name, (_, status) in collected.items():
+            result["source_status"][name] = status
+            if status != "ok":
+                result["missing_sources"].append(name)
+
+        print(f"⏱️ All sources settled in {time.perf_counter() - started:.1f}s\n")
+
+        # --------------------------------------------------
+        # 2️⃣ Merge deterministically (fixed source order)
+        # --------------------------------------------------
+        self._merge_competitors(result, collected["competitors"][0])
+        self._merge_enrichment(result, collected["enrichment"][0])
+        print(f"✅ Added {len(result['competitors'])} competitors from Tavily")
+
+        self._merge_producthunt(result, collected["producthunt"][0])
+        print(f"✅ Added {len([c for c in result['competitors'] if c['source'] == 'producthunt'])} competitors from Product Hunt\n")
+
+        self._merge_pain_points(result, collected["pain_points"][0])
+        self._merge_communities(result, collected["communities"][0])
+        self._merge_alternatives(result, collected["alternatives"][0])
+        self._merge_search_trends(result, collected["search_trends"][0])
+
+        print(f"✅ Market Intelligence Summary:")
+        print(f"   - Pain Points: {len(result['market_intelligence']['pain_points'])}")
+        print(f"   - Communities: {len(result['market_intelligence']['communities'])}")
+        print(f"   - Alternatives: {len(result['market_intelligence']['existing_alternatives'])}")
+        print(f"   - Demand Signals: {len(result['market_intelligence']['demand_signals'])}")
+        print()
+
+        # --------------------------------------------------
+        # 3️⃣ Final Summary
+        # --------------------------------------------------
+        print("=" * 50)
+        print("✅ Data Collection Complete!")
+        print("=" * 50)
+        print(f"📊 Total Competitors: {len(result['competitors'])}")
+        print(f"📊 Total Market Signals: {sum(len(v) for v in result['market_intelligence'].values())}")
+        if result["missing_sources"]:
+            print(f"⚠️ Missing sources: {', '.join(result['missing_sources'])}")
+        print()
+
+        return result
+
+    async def _fetch_source(self, name: str, coro, deadline: Optional[Deadline] = None) -> tuple:
+        """
+        Await a single source within its timeout budget.
+
+        Returns (items, status). A slow or failing source never fails
+        the whole collection, it just contributes no items. Status is
+        "deadline" when the run's deadline, not the budget, cut it off.
+        """
+        budget = self.source_timeouts.get(name, settings.COLLECTOR_TAVILY_TIMEOUT)
+        timeout = deadline.cap(budget) if deadline else budget
+        started = time.perf_counter()
+
+        try:
+            items = await asyncio.wait_for(coro, timeout=timeout)
+            items = items or []
+            print(f"   ✅ {name}: {len(items)} items in {time.perf_counter() - started:.1f}s")
+            return items, "ok"
+
+        except asyncio.TimeoutError:
+            # Also raised by a provider's own adaptive timeout, before ours
+            elapsed = time.perf_counter() - started
+            print(f"   ⚠️ {name}: timed out after {elapsed:.0f}s")
+            return [], "deadline" if timeout < budget and elapsed >= timeout else "timeout"
+
+        except Exception as e:
+            print(f"   ❌ {name}: {e}")
+            return [], "error"
+
+    async def _enrich_competitors(self, competitors_task) -> list:
+        """
+        Scrape the top-N Tavily competitors as soon as they are known,
+        in parallel with the remaining market signal searches.
+        """
+        top_n = settings.ENRICH_TOP_COMPETITORS
+        if top_n <= 0:
+            return []
+
+        # asyncio.wait does not raise if the search timed out (cancelled) or failed
+        await asyncio.wait([competitors_task])
+        if competitors_task.cancelled() or competitors_task.exception():
+            return []
+
+        competitors = competitors_task.result() or []
+        urls = [item.get("url") for item in competitors[:top_n]]
+
+        scraped = []
+        async for page in playwright_service.scrape_many(urls):
+            if page.get("success"):
+                scraped.append(page)
+
+        return scraped
+
+    async def _collect_producthunt(self, product_idea: str) -> list:
+        """
+        Product Hunt products (empty without an API token).
+        """
+        if not settings.PRODUCTHUNT_API_TOKEN.strip():
+            return []
+
+        return await producthunt_service.search_products(product_idea)
+
+    async def _collect_search_trends(self, product_idea: str) -> list:
+        """
+        SerpAPI search demand as a single-item source (empty without a key).
+        Raises when SerpAPI returned no usable data, so the source is
+        reported as missing.
+        """
+        if not settings.SERPAPI_KEY:
+            return []
+
+        trends = await serp_trends_service.analyze_keyword(product_idea)
+        if not trends.get("data_available"):
+            raise Exception(trends.get("error") or "No search trend data")
+        return [trends]
+
+    # --------------------------------------------------
+    # Merge helpers
+    # --------------------------------------------------
+    def _merge_competitors(self, result: dict, tavily_competitors: list):
         for item in tavily_competitors:
             # Extract competitor info from Tavily results
             result["competitors"].append({
@@ -46,17 +222,23 @@ class DataCollector:
                 "confidence_score": round(item.get("score", 0.7), 2)
             })
 
-        print(f"✅ Added {len(result['competitors'])} competitors from Tavily\n")
+    def _merge_enrichment(self, result: dict, scraped_pages: list):
+        pages = {page["fingerprint"]: page for page in scraped_pages}
 
-        # --------------------------------------------------
-        # 2️⃣ Product Hunt → Additional competitors (if any)
-        # --------------------------------------------------
-        print("=" * 50)
-        print("🔍 Phase 2: Checking Product Hunt...")
-        print("=" * 50)
-        
-        ph_products = producthunt_service.search_products(product_idea)
+        for competitor in result["competitors"]:
+            page = pages.get(url_fingerprint(competitor.get("url") or ""))
+            if not page:
+                continue
 
+            competitor.update({
+                "site_headline": page.get("headline"),
+                "pricing": page.get("pricing"),
+                "features": page.get("features", []),
+                "ctas": page.get("ctas", []),
+                "enriched": True
+            })
+
+    def _merge_producthunt(self, result: dict, ph_products: list):
         for product in ph_products:
             url = product.get("url")
             if not url:
@@ -75,19 +257,7 @@ class DataCollector:
                 "confidence_score": 0.9
             })
 
-        print(f"✅ Added {len([c for c in result['competitors'] if c['source'] == 'producthunt'])} competitors from Product Hunt\n")
-
-        # --------------------------------------------------
-        # 3️⃣ Tavily → Market Intelligence
-        # --------------------------------------------------
-        print("=" * 50)
-        print("🔍 Phase 3: Gathering market intelligence...")
-        print("=" * 50)
-        
-        # Search for pain points and user needs
-        pain_query = f"{product_idea} problems pain points complaints issues challenges"
-        pain_results = await tavily_service.search_market_signals(pain_query, max_results=8)
-        
+    def _merge_pain_points(self, result: dict, pain_results: list):
         for item in pain_results:
             result["market_intelligence"]["pain_points"].append({
                 "title": item.get("title"),
@@ -96,16 +266,13 @@ class DataCollector:
                 "confidence_score": round(item.get("score", 0.5), 2)
             })
 
-        # Search for communities and discussions
-        community_query = f"{product_idea} community forum reddit discord slack groups"
-        community_results = await tavily_service.search_market_signals(community_query, max_results=5)
-        
+    def _merge_communities(self, result: dict, community_results: list):
         for item in community_results:
             classification = classify_market_signal(
                 url=item.get("url", ""),
                 content=item.get("content", "")
             )
-            
+
             result["market_intelligence"][classification].append({
                 "title": item.get("title"),
                 "url": item.get("url"),
@@ -113,16 +280,13 @@ class DataCollector:
                 "confidence_score": round(item.get("score", 0.5), 2)
             })
 
-        # Search for alternatives and solutions
-        alternatives_query = f"{product_idea} alternatives solutions tools software"
-        alt_results = await tavily_service.search_market_signals(alternatives_query, max_results=8)
-        
+    def _merge_alternatives(self, result: dict, alt_results: list):
         for item in alt_results:
             # Check if it's a competitor (already added)
             url = item.get("url", "")
             if any(comp.get("url") == url for comp in result["competitors"]):
                 continue
-                
+
             result["market_intelligence"]["existing_alternatives"].append({
                 "title": item.get("title"),
                 "url": url,
@@ -130,24 +294,19 @@ class DataCollector:
                 "confidence_score": round(item.get("score", 0.5), 2)
             })
 
-        print(f"✅ Market Intelligence Summary:")
-        print(f"   - Pain Points: {len(result['market_intelligence']['pain_points'])}")
-        print(f"   - Communities: {len(result['market_intelligence']['communities'])}")
-        print(f"   - Alternatives: {len(result['market_intelligence']['existing_alternatives'])}")
-        print(f"   - Demand Signals: {len(result['market_intelligence']['demand_signals'])}")
-        print()
-
-        # --------------------------------------------------
-        # 4️⃣ Final Summary
-        # --------------------------------------------------
-        print("=" * 50)
-        print("✅ Data Collection Complete!")
-        print("=" * 50)
-        print(f"📊 Total Competitors: {len(result['competitors'])}")
-        print(f"📊 Total Market Signals: {sum(len(v) for v in result['market_intelligence'].values())}")
-        print()
-
-        return result
+    def _merge_search_trends(self, result: dict, trends: list):
+        for item in trends:
+            result["market_intelligence"]["demand_signals"].append({
+                "title": f"Search demand: {item['trend']} ({item['estimated_result_count']:,} results)",
+                "url": None,
+                "summary": "; ".join(item.get("people_also_ask", [])[:5])[:300],
+                "trend": item["trend"],
+                "estimated_result_count": item["estimated_result_count"],
+                "related_searches": item.get("related_searches", []),
+                "people_also_ask": item.get("people_also_ask", []),
+                "source": "serpapi",
+                "confidence_score": 0.8
+            })
 
     def _extract_company_name(self, title: str) -> str:
         """
@@ -156,16 +315,16 @@ class DataCollector:
         # Remove common suffixes
         title = title.replace(" - Official Site", "")
         title = title.replace(" | ", " - ")
-        
+
         # Take first part before dash or pipe
         if " - " in title:
             return title.split(" - ")[0].strip()
         elif "|" in title:
             return title.split("|")[0].strip()
-        
+
         # Return first 5 words max
         words = title.split()
         return " ".join(words[:5])
 
 
-data_collector = DataCollector()
\ No newline at end of file
+data_collector = DataCollector()
@@ -3,9 +3,156 @@
 # app/services/gemini_service.py
 
 import google.generativeai as genai
+from google.api_core.exceptions import ResourceExhausted
 from app.core.config import settings
+from app.core.rate_limiter import rate_limiter
+from app.utils.json_stream import IncrementalObjectParser
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Awaitable, Callable
+import asyncio
+
+
+# --------------------------------------------------
+# Dashboard sections
+# --------------------------------------------------
+# Each section declares the slices of market data and base analysis it
+# needs, so it can be generated on its own in a sharded expansion.
+# Sections with needs_base=False only use market evidence.
+DASHBOARD_SECTIONS = {
+    "category_diagnosis": {
+        "description": "MOST IMPORTANT: Detailed category positioning analysis with clear verdict",
+        "instructions": """
+CATEGORY DIAGNOSIS (TOP PRIORITY!)
+   - Start with a clear verdict: "You ARE competing in the right category" OR "You should REFRAME to X category"
+   - Explain WHAT category they assumed vs what you recommend
+   - Explain WHY (with market evidence)
+   - Show the IMPACT of reframing (or not)
+   - Be concrete: "Instead of positioning as [X], position as [Y]"
+   - Include confidence level and reasoning
+   - Make this 2-3 paragraphs, detailed and actionable
+""",
+        "needs_base": True,
+        "market_data": ["competitors", "existing_alternatives"],
+        "base_analysis": ["category_diagnosis", "competitive_landscape"]
+    },
+    "overview": {
+        "description": "Executive summary and key takeaways",
+        "instructions": """
+OVERVIEW
+   - Executive summary of the entire analysis
+   - Key takeaways and action items
+   - 1-2 paragraphs max
+""",
+        "needs_base": True,
+        "market_data": ["competitors", "pain_points", "existing_alternatives", "demand_signals"],
+        "base_analysis": ["category_diagnosis", "market_timing", "competitive_landscape", "strategy", "overall_confidence"]
+    },
+    "market_reality": {
+        "description": "Market size, trends, and dynamics",
+        "instructions": """
+MARKET REALITY
+   - Market size, growth trends, saturation level
+   - Current dynamics and forces
+   - What's working vs dying
+   - Evidence from the collected data
+""",
+        "needs_base": False,
+        "market_data": ["competitors", "existing_alternatives", "demand_signals", "general_insight"],
+        "base_analysis": []
+    },
+    "competitive_landscape": {
+        "description": "Competitor analysis with specific examples",
+        "instructions": """
+COMPETITIVE LANDSCAPE
+   - Who the REAL competitors are (not just feature comparisons)
+   - Their positioning, pricing, strengths/weaknesses
+   - Market gaps and opportunities
+   - Specific company examples from the data
+""",
+        "needs_base": True,
+        "market_data": ["competitors", "existing_alternatives"],
+        "base_analysis": ["category_diagnosis", "competitive_landscape"]
+    },
+    "user_pain_and_desires": {
+        "description": "User complaints, needs, and desires",
+        "instructions": """
+USER PAIN & DESIRES
+   - What users complain about (from pain_points data)
+   - What they're really asking for
+   - Unmet needs and desires
+   - Quote actual pain points if available
+""",
+        "needs_base": False,
+        "market_data": ["pain_points", "communities"],
+        "base_analysis": []
+    },
+    "strategy_and_positioning": {
+        "description": "Unique positioning and differentiation strategy",
+        "instructions": """
+STRATEGY & POSITIONING
+   - How to position uniquely in the market
+   - What angle to take
+   - Key differentiators to emphasize
+   - Messaging direction
+""",
+        "needs_base": True,
+        "market_data": ["competitors", "pain_points"],
+        "base_analysis": ["category_diagnosis", "competitive_landscape", "strategy"]
+    },
+    "mvp_blueprint": {
+        "description": "What to build first and what to skip",
+        "instructions": """
+MVP BLUEPRINT
+   - Must-have features for launch
+   - Features to skip initially
+   - Build sequence and priorities
+   - Concrete feature list
+""",
+        "needs_base": True,
+        "market_data": ["pain_points", "existing_alternatives"],
+        "base_analysis": ["strategy"]
+    },
+    "pricing_and_monetization": {
+        "description": "Pricing model and justification",
+        "instructions": """
+PRICING & MONETIZATION
+   - Recommended pricing model (free/freemium/paid)
+   - Price point suggestion with justification
+   - Based on competitor pricing from data
+   - Monetization strategy
+""",
+        "needs_base": True,
+        "market_data": ["competitors"],
+        "base_analysis": ["strategy"]
+    },
+    "go_to_market": {
+        "description": "Distribution channels and launch strategy",
+        "instructions": """
+GO-TO-MARKET
+   - Where to find early users
+   - Distribution channels to focus on
+   - Communities to target (from communities data)
+   - Launch strategy
+""",
+        "needs_base": True,
+        "market_data": ["communities", "demand_signals"],
+        "base_analysis": ["category_diagnosis", "strategy"]
+    },
+    "risks_and_unknowns": {
+        "description": "Risks, uncertainties, and assumptions to validate",
+        "instructions": """
+RISKS & UNKNOWNS
+    - What could go wrong
+    - Market uncertainties
+    - Assumptions to validate
+    - Red flags
+""",
+        "needs_base": True,
+        "market_data": ["competitors", "pain_points", "demand_signals"],
+        "base_analysis": ["category_diagnosis", "market_timing", "competitive_landscape"]
+    }
+}
+
 
 
 class GeminiService:
@@ -28,7 +175,93 @@ class GeminiService:
         Generate STRICT JSON output from Gemini.
         """
 
-        full_prompt = f"""
+        full_prompt = self._build_structured_prompt(prompt, response_schema)
+
+        try:
+            response = self.model.generate_content(full_prompt)
+            return self._parse_structured_response(response.text)
+
+        except Exception as e:
+            print(f"❌ Gemini error: {e}")
+            raise
+
+    async def generate_structured_async(
+        self,
+        prompt: str,
+        response_schema: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of generate_structured.
+
+        Uses the model's native async API so the event loop stays free
+        while the LLM is generating.
+        """
+
+        full_prompt = self._build_structured_prompt(prompt, response_schema)
+
+        try:
+            async with rate_limiter.limit("gemini"):
+                response = await self.model.generate_content_async(full_prompt)
+            return self._parse_structured_response(response.text)
+
+        except ResourceExhausted:
+            rate_limiter.backoff("gemini")
+            raise
+
+        except Exception as e:
+            print(f"❌ Gemini error: {e}")
+            raise
+
+    async def stream_structured(
+        self,
+        prompt: str,
+        response_schema: Dict[str, Any],
+        on_member: Callable[[str, Any], Awaitable[None]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Stream STRICT JSON output from Gemini.
+
+        Top-level members are handed to `on_member` as soon as they are
+        complete, while the model is still generating the rest. The
+        returned dict is parsed from the full response text.
+        """
+
+        full_prompt = self._build_structured_prompt(prompt, response_schema)
+        parser = IncrementalObjectParser()
+        chunks = []
+
+        try:
+            # The slot is held for the whole stream
+            async with rate_limiter.limit("gemini"):
+                response = await self.model.generate_content_async(full_prompt, stream=True)
+
+                async for chunk in response:
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        # Chunk without text parts (e.g. finish metadata)
+                        continue
+
+                    chunks.append(text)
+                    for key, value in parser.feed(text):
+                        await on_member(key, value)
+
+        except ResourceExhausted:
+            rate_limiter.backoff("gemini")
+            raise
+
+        except Exception as e:
+            print(f"❌ Gemini error: {e}")
+            raise
+
+        return self._parse_structured_response("".join(chunks))
+
+    def _build_structured_prompt(
+        self,
+        prompt: str,
+        response_schema: Dict[str, Any]
+    ) -> str:
+        return f"""
 {prompt}
 
 You MUST respond with ONLY valid JSON.
@@ -42,13 +275,13 @@ Rules:
 - No text outside JSON
 """
 
-        try:
-            response = self.model.generate_content(full_prompt)
-            raw = response.text.strip()
+    def _parse_structured_response(self, text: str) -> Optional[Dict[str, Any]]:
+        raw = text.strip()
 
-            # Safety cleanup (Gemini sometimes slips)
-            raw = raw.replace("```json", "").replace("```", "").strip()
+        # Safety cleanup (Gemini sometimes slips)
+        raw = raw.replace("```json", "").replace("```", "").strip()
 
+        try:
             return json.loads(raw)
 
         except json.JSONDecodeError:
@@ -56,10 +289,6 @@ Rules:
             print("Raw output:", raw[:500])
             return None
 
-        except Exception as e:
-            print(f"❌ Gemini error: {e}")
-            raise
-
     def expand_dashboard_analysis(
         self,
         collected_data: dict,
@@ -71,15 +300,189 @@ Rules:
         CRITICAL: Category Diagnosis is the #1 priority - this is our main USP!
         """
 
-        # Extract category diagnosis from base analysis
-        category_data = base_analysis.get("category_diagnosis", {})
-        
-        prompt = f"""
+        prompt, response_schema = self._build_dashboard_request(collected_data, base_analysis)
+        result = self.generate_structured(prompt, response_schema)
+        return self._apply_category_fallback(result, base_analysis)
+
+    async def expand_dashboard_analysis_async(
+        self,
+        collected_data: dict,
+        base_analysis: dict
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of expand_dashboard_analysis.
+        """
+
+        prompt, response_schema = self._build_dashboard_request(collected_data, base_analysis)
+        result = await self.generate_structured_async(prompt, response_schema)
+        return self._apply_category_fallback(result, base_analysis)
+
+    async def expand_dashboard_analysis_stream(
+        self,
+        collected_data: dict,
+        base_analysis: dict,
+        on_section: Callable[[str, Any], Awaitable[None]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Streaming variant of expand_dashboard_analysis.
+
+        Each dashboard section is passed to `on_section` the moment it
+        has been generated, instead of after the whole JSON is parsed.
+        """
+
+        prompt, response_schema = self._build_dashboard_request(collected_data, base_analysis)
+        result = await self.stream_structured(prompt, response_schema, on_section)
+        return await self._finalize_dashboard(result, base_analysis, on_section)
+
+    async def expand_dashboard_analysis_sharded(
+        self,
+        collected_data: dict,
+        base_analysis: Awaitable[Optional[dict]],
+        on_section: Optional[Callable[[str, Any], Awaitable[None]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Generate the dashboard as independent section shards in parallel.
+
+        `base_analysis` is an awaitable (usually the running stage-1
+        task): shards that only need market evidence start right away,
+        overlapping with stage 1, and the rest start once it resolves.
+        Falls back to a single expansion call if any shard fails.
+        """
+
+        shards = self.plan_dashboard_shards(settings.DASHBOARD_SHARD_COUNT)
+        print(f"🧩 Expanding dashboard in {len(shards)} shards")
+
+        async def run_shard(sections: list) -> Optional[Dict[str, Any]]:
+            needs_base = any(DASHBOARD_SECTIONS[s]["needs_base"] for s in sections)
+            base = await base_analysis if needs_base else None
+
+            if needs_base and base is None:
+                return None
+
+            return await self._expand_sections(collected_data, base, sections, on_section)
+
+        results = await asyncio.gather(
+            *(run_shard(sections) for sections in shards),
+            return_exceptions=True
+        )
+        base = await base_analysis
+
+        if base is None:
+            return None
+
+        if any(r is None or isinstance(r, Exception) for r in results):
+            print("⚠️ Dashboard shard failed, falling back to single expansion call")
+            return await self._expand_sections(collected_data, base, list(DASHBOARD_SECTIONS), on_section, fallback=True)
+
+        merged = {}
+        for section in DASHBOARD_SECTIONS:
+            for result in results:
+                if section in result:
+                    merged[section] = result[section]
+                    break
+
+        return await self._finalize_dashboard(merged, base, on_section)
+
+    def plan_dashboard_shards(self, shard_count: int) -> list:
+        """
+        Split dashboard sections into shards.
+
+        Evidence-only sections get their own shard (it can run before
+        the base analysis exists); the remaining sections are spread
+        round-robin over the other shards.
+        """
+
+        if shard_count <= 1:
+            return [list(DASHBOARD_SECTIONS)]
+
+        evidence_only = [s for s, spec in DASHBOARD_SECTIONS.items() if not spec["needs_base"]]
+        needs_base = [s for s, spec in DASHBOARD_SECTIONS.items() if spec["needs_base"]]
+
+        base_shards = [[] for _ in range(max(1, shard_count - 1))]
+        for i, section in enumerate(needs_base):
+            base_shards[i % len(base_shards)].append(section)
+
+        return [shard for shard in [evidence_only] + base_shards if shard]
+
+    async def _expand_sections(
+        self,
+        collected_data: dict,
+        base_analysis: Optional[dict],
+        sections: list,
+        on_section: Optional[Callable[[str, Any], Awaitable[None]]],
+        fallback: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Run one expansion call for the given sections (streamed when a
+        callback is given). With fallback=True the category diagnosis
+        fallback is applied too.
+        """
+
+        prompt, response_schema = self._build_dashboard_request(collected_data, base_analysis, sections)
+
+        if on_section:
+            result = await self.stream_structured(prompt, response_schema, on_section)
+        else:
+            result = await self.generate_structured_async(prompt, response_schema)
+
+        if fallback:
+            return await self._finalize_dashboard(result, base_analysis, on_section)
+
+        return result
+
+    async def _finalize_dashboard(
+        self,
+        result: Optional[Dict[str, Any]],
+        base_analysis: dict,
+        on_section: Optional[Callable[[str, Any], Awaitable[None]]]
+    ) -> Optional[Dict[str, Any]]:
+        streamed_diagnosis = (result or {}).get("category_diagnosis")
+        result = self._apply_category_fallback(result, base_analysis)
+
+        # The fallback diagnosis was never streamed, emit it now
+        if on_section and result and result.get("category_diagnosis") != streamed_diagnosis:
+            await on_section("category_diagnosis", result["category_diagnosis"])
+
+        return result
+
+    def _build_dashboard_request(
+        self,
+        collected_data: dict,
+        base_analysis: Optional[dict],
+        sections: Optional[list] = None
+    ) -> tuple:
+        """
+        Build the dashboard expansion prompt and its response schema.
+
+        With `sections`, only those sections are requested and only the
+        slices of market data and base analysis they use are included.
+        """
+
+        sections = sections or list(DASHBOARD_SECTIONS)
+        full_dashboard = len(sections) == len(DASHBOARD_SECTIONS)
+
+        if full_dashboard:
+            market_data = collected_data
+            base_summary = base_analysis
+        else:
+            market_data = self._slice_market_data(collected_data, sections)
+            base_summary = self._slice_base_analysis(base_analysis, sections)
+
+        prompt = """
 You are an expert market analyst helping founders validate their product strategy.
+"""
 
+        if "category_diagnosis" in sections:
+            prompt += """
 CRITICAL FOCUS: Category Diagnosis is THE MOST IMPORTANT insight you provide.
 This is what founders come here for - helping them figure out if they're competing in the right category.
+"""
+
+        if base_summary is not None:
+            # Extract category diagnosis from base analysis
+            category_data = base_analysis.get("category_diagnosis", {})
 
+            prompt += f"""
 You are given:
 1. Raw market data (competitors, pain points, communities)
 2. A base analysis with initial category diagnosis
@@ -88,81 +491,37 @@ Your task:
 Expand this into a comprehensive, actionable dashboard analysis.
 
 Raw Market Data:
-{json.dumps(collected_data, indent=2)[:4000]}
+{json.dumps(market_data, indent=2)[:4000]}
 
 Base Analysis Summary:
-{json.dumps(base_analysis, indent=2)[:2000]}
+{json.dumps(base_summary, indent=2)[:2000]}
 
 Category Diagnosis from Base Analysis:
 - Current/Assumed Category: {category_data.get('assumed_category', 'Not specified')}
 - Recommended Category: {category_data.get('recommended_category', 'Not specified')}
 - Should Reframe: {category_data.get('should_reframe', False)}
 - Reasoning: {category_data.get('reasoning', 'No reasoning provided')}
+"""
+        else:
+            prompt += f"""
+You are given raw market data (competitors, pain points, communities).
 
-DASHBOARD SECTIONS TO CREATE:
-
-1. CATEGORY DIAGNOSIS (TOP PRIORITY!)
-   - Start with a clear verdict: "You ARE competing in the right category" OR "You should REFRAME to X category"
-   - Explain WHAT category they assumed vs what you recommend
-   - Explain WHY (with market evidence)
-   - Show the IMPACT of reframing (or not)
-   - Be concrete: "Instead of positioning as [X], position as [Y]"
-   - Include confidence level and reasoning
-   - Make this 2-3 paragraphs, detailed and actionable
-
-2. OVERVIEW
-   - Executive summary of the entire analysis
-   - Key takeaways and action items
-   - 1-2 paragraphs max
-
-3. MARKET REALITY
-   - Market size, growth trends, saturation level
-   - Current dynamics and forces
-   - What's working vs dying
-   - Evidence from the collected data
-
-4. COMPETITIVE LANDSCAPE
-   - Who the REAL competitors are (not just feature comparisons)
-   - Their positioning, pricing, strengths/weaknesses
-   - Market gaps and opportunities
-   - Specific company examples from the data
-
-5. USER PAIN & DESIRES
-   - What users complain about (from pain_points data)
-   - What they're really asking for
-   - Unmet needs and desires
-   - Quote actual pain points if available
-
-6. STRATEGY & POSITIONING
-   - How to position uniquely in the market
-   - What angle to take
-   - Key differentiators to emphasize
-   - Messaging direction
-
-7. MVP BLUEPRINT
-   - Must-have features for launch
-   - Features to skip initially
-   - Build sequence and priorities
-   - Concrete feature list
-
-8. PRICING & MONETIZATION
-   - Recommended pricing model (free/freemium/paid)
-   - Price point suggestion with justification
-   - Based on competitor pricing from data
-   - Monetization strategy
+Your task:
+Turn it into actionable dashboard sections.
 
-9. GO-TO-MARKET
-   - Where to find early users
-   - Distribution channels to focus on
-   - Communities to target (from communities data)
-   - Launch strategy
+Raw Market Data:
+{json.dumps(market_data, indent=2)[:4000]}
+"""
 
-10. RISKS & UNKNOWNS
-    - What could go wrong
-    - Market uncertainties
-    - Assumptions to validate
-    - Red flags
+        prompt += """
+DASHBOARD SECTIONS TO CREATE:
+"""
+        for number, section in enumerate(sections, 1):
+            prompt += f"""
+{number}. {DASHBOARD_SECTIONS[section]["instructions"].strip()}
+"""
 
+        prompt += """
 IMPORTANT RULES:
 - Be specific, not generic
 - Use evidence from the market data
@@ -173,50 +532,59 @@ IMPORTANT RULES:
 """
 
         response_schema = {
-            "category_diagnosis": {
-                "type": "string",
-                "description": "MOST IMPORTANT: Detailed category positioning analysis with clear verdict"
-            },
-            "overview": {
-                "type": "string",
-                "description": "Executive summary and key takeaways"
-            },
-            "market_reality": {
+            section: {
                 "type": "string",
-                "description": "Market size, trends, and dynamics"
-            },
-            "competitive_landscape": {
-                "type": "string",
-                "description": "Competitor analysis with specific examples"
-            },
-            "user_pain_and_desires": {
-                "type": "string",
-                "description": "User complaints, needs, and desires"
-            },
-            "strategy_and_positioning": {
-                "type": "string",
-                "description": "Unique positioning and differentiation strategy"
-            },
-            "mvp_blueprint": {
-                "type": "string",
-                "description": "What to build first and what to skip"
-            },
-            "pricing_and_monetization": {
-                "type": "string",
-                "description": "Pricing model and justification"
-            },
-            "go_to_market": {
-                "type": "string",
-                "description": "Distribution channels and launch strategy"
-            },
-            "risks_and_unknowns": {
-                "type": "string",
-                "description": "Risks, uncertainties, and assumptions to validate"
+                "description": DASHBOARD_SECTIONS[section]["description"]
             }
+            for section in sections
         }
 
-        result = self.generate_structured(prompt, response_schema)
-        
+        return prompt, response_schema
+
+    def _slice_market_data(self, collected_data: dict, sections: list) -> dict:
+        """
+        Keep only the parts of the collected data these sections use.
+        """
+        wanted = set()
+        for section in sections:
+            wanted.update(DASHBOARD_SECTIONS[section]["market_data"])
+
+        intelligence = collected_data.get("market_intelligence", {})
+        sliced = {"product_idea": collected_data.get("product_idea")}
+
+        if "competitors" in wanted:
+            sliced["competitors"] = collected_data.get("competitors", [])
+
+        sliced["market_intelligence"] = {
+            key: value for key, value in intelligence.items() if key in wanted
+        }
+
+        return sliced
+
+    def _slice_base_analysis(self, base_analysis: Optional[dict], sections: list) -> Optional[dict]:
+        """
+        Keep only the parts of the base analysis these sections use.
+        """
+        if base_analysis is None:
+            return None
+
+        wanted = set()
+        for section in sections:
+            wanted.update(DASHBOARD_SECTIONS[section]["base_analysis"])
+
+        return {key: value for key, value in base_analysis.items() if key in wanted}
+
+    def _apply_category_fallback(
+        self,
+        result: Optional[Dict[str, Any]],
+        base_analysis: dict
+    ) -> Optional[Dict[str, Any]]:
+        """
+        If category_diagnosis is missing or empty, create one from base_analysis.
+        """
+
+        category_data = base_analysis.get("category_diagnosis", {})
+
         # Fallback: If category_diagnosis is missing or empty, create one from base_analysis
         if result and (not result.get("category_diagnosis") or result.get("category_diagnosis").strip() == ""):
             
@@ -0,0 +1,136 @@
+# app/services/job_queue.py
+
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from app.core.config import settings
+
+
+class JobQueueFullError(Exception):
+    """
+    Raised when the background queue cannot accept more jobs.
+    """
+
+
+class JobQueue:
+    """
+    Bounded in-process worker pool for background analysis jobs.
+
+    Jobs are queued as (job_id, handler, args) and picked up by a fixed
+    number of worker tasks, so at most `concurrency` pipelines run at
+    the same time per process.
+    """
+
+    def __init__(self, concurrency: int, max_size: int):
+        self.concurrency = max(1, concurrency)
+        self.max_size = max_size
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: list = []
+        self.running_jobs: set = set()
+        self.closing = False
+
+    async def start(self):
+        if self.workers:
+            return  # Already started
+
+        self.queue = asyncio.Queue(maxsize=self.max_size)
+        self.closing = False
+        self.workers = [
+            asyncio.create_task(self._worker(i))
+            for i in range(self.concurrency)
+        ]
+        print(f"✅ Job queue started ({self.concurrency} workers)")
+
+    async def stop(
+        self,
+        grace_seconds: float = 0,
+        on_abandoned: Optional[Callable[[str, str], Awaitable]] = None
+    ):
+        """
+        Stop the workers.
+
+        Queued jobs are dropped right away; running jobs get `grace_seconds`
+        to finish before they are cancelled. Every job that did not finish
+        is passed to `on_abandoned(job_id, reason)`, so its record does not
+        stay queued or processing forever.
+        """
+        if not self.workers:
+            return
+
+        self.closing = True
+
+        dropped = []
+        while not self.queue.empty():
+            job_id, _, _ = self.queue.get_nowait()
+            self.queue.task_done()
+            dropped.append(job_id)
+
+        if self.running_jobs and grace_seconds > 0:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=grace_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+        cancelled = list(self.running_jobs)
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+
+        self.workers = []
+        self.queue = None
+
+        if on_abandoned:
+            for job_id in dropped + cancelled:
+                try:
+                    await on_abandoned(job_id, "Server shut down before the analysis finished")
+                except Exception as e:
+                    print(f"⚠️ Could not mark job {job_id} as failed: {e}")
+
+        print(f"👋 Job queue stopped ({len(dropped)} queued jobs dropped, {len(cancelled)} running jobs cancelled)")
+
+    def submit(
+        self,
+        job_id: str,
+        handler: Callable[..., Awaitable],
+        *args
+    ):
+        """
+        Queue a job. Raises JobQueueFullError when the queue is at capacity.
+        """
+        if self.queue is None or self.closing:
+            raise JobQueueFullError("Job queue is not running")
+
+        try:
+            self.queue.put_nowait((job_id, handler, args))
+        except asyncio.QueueFull:
+            raise JobQueueFullError("Too many analyses in progress, try again shortly")
+
+        print(f"📥 Queued job {job_id} ({self.queue.qsize()} waiting)")
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self.workers),
+            "running": len(self.running_jobs),
+            "queued": self.queue.qsize() if self.queue else 0,
+            "max_size": self.max_size
+        }
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job_id, handler, args = await self.queue.get()
+            self.running_jobs.add(job_id)
+
+            try:
+                await handler(job_id, *args)
+            except Exception as e:
+                # The handler records the failure on the job itself
+                print(f"❌ Worker {worker_id} job {job_id} failed: {e}")
+            finally:
+                self.running_jobs.discard(job_id)
+                self.queue.task_done()
+
+
+job_queue = JobQueue(
+    concurrency=settings.ANALYSIS_WORKER_CONCURRENCY,
+    max_size=settings.ANALYSIS_QUEUE_MAX_SIZE
+)
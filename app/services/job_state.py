@@ -0,0 +1,144 @@
+# app/services/job_state.py
+
+import asyncio
+from typing import Optional
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.database import get_async_database
+
+
+class JobStateWriter:
+    """
+    Buffered writer for job progress on the `analyses` collection.
+
+    - Progress checkpoints are kept in memory and merged per job
+    - Pending changes are flushed with one bulk_write per interval
+    - Terminal states (complete / failed) are written immediately
+    - /results overlays the in-memory state so readers never lag
+    """
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self.collection_name = "analyses"
+
+        # job_id -> latest known fields for running jobs
+        self._state: dict = {}
+        # job_id -> fields not yet written to Mongo
+        self._pending: dict = {}
+
+        self._task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+
+        self._updates = 0
+        self._flushes = 0
+        self._documents_written = 0
+
+    async def start(self):
+        if self._task:
+            return  # Already started
+
+        self._write_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._flush_loop())
+        print(f"✅ Job state writer started (flush every {self.flush_interval}s)")
+
+    async def stop(self):
+        if not self._task:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+        await self.flush()
+        print("👋 Job state writer stopped")
+
+    def update(self, job_id: str, fields: dict):
+        """
+        Record a non-terminal change. Written on the next flush.
+        """
+        self._updates += 1
+        self._state.setdefault(job_id, {}).update(fields)
+        self._pending.setdefault(job_id, {}).update(fields)
+
+    async def finish(self, job_id: str, fields: dict):
+        """
+        Write a terminal state now, together with anything still pending.
+        """
+        async with self._lock():
+            merged = {**self._pending.pop(job_id, {}), **fields}
+
+            try:
+                await get_async_database()[self.collection_name].update_one(
+                    {"job_id": job_id},
+                    {"$set": merged}
+                )
+            finally:
+                # Dropped only after the write so readers never see a gap
+                self._state.pop(job_id, None)
+
+    def overlay(self, doc: dict, projection: Optional[dict] = None) -> dict:
+        """
+        Apply in-memory state to a job document read from Mongo.
+        """
+        state = self._state.get(doc.get("job_id"))
+        if not state:
+            return doc
+
+        for field, value in state.items():
+            if projection is None or projection.get(field):
+                doc[field] = value
+
+        return doc
+
+    async def flush(self):
+        async with self._lock():
+            if not self._pending:
+                return
+
+            batch, self._pending = self._pending, {}
+
+            try:
+                await get_async_database()[self.collection_name].bulk_write(
+                    [UpdateOne({"job_id": job_id}, {"$set": fields}) for job_id, fields in batch.items()],
+                    ordered=False
+                )
+                self._flushes += 1
+                self._documents_written += len(batch)
+
+            except Exception as e:
+                print(f"⚠️ Job state flush failed, will retry: {e}")
+
+                # Put unwritten changes back for jobs that are still running,
+                # newer updates take precedence
+                for job_id, fields in batch.items():
+                    if job_id in self._state:
+                        self._pending[job_id] = {**fields, **self._pending.get(job_id, {})}
+
+    def stats(self) -> dict:
+        return {
+            "tracked_jobs": len(self._state),
+            "pending_jobs": len(self._pending),
+            "updates": self._updates,
+            "flushes": self._flushes,
+            "documents_written": self._documents_written
+        }
+
+    # --------------------------------------------------
+    # Internals
+    # --------------------------------------------------
+    def _lock(self) -> asyncio.Lock:
+        # Flushes and terminal writes are serialized so an older
+        # progress batch can never land after a job's final state
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        return self._write_lock
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+
+job_state = JobStateWriter(flush_interval=settings.JOB_STATE_FLUSH_INTERVAL_MS / 1000)
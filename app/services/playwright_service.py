@@ -1,47 +1,203 @@
 # app/services/playwright_service.py
 
-from playwright.async_api import async_playwright
-from typing import Dict, List
+from typing import AsyncIterator, Dict, Iterable, Optional
+import asyncio
 import re
+import httpx
+from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.services.browser_pool import browser_pool, USER_AGENT
+from app.services.scrape_cache import scrape_cache
 from app.utils.fingerprint import url_fingerprint
+from app.utils.html_extractor import extract_landing_page
+
+
+# Sent with static (non-browser) fetches so pages serve the same HTML
+STATIC_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml"
+}
+
+# Runs inside the page and returns every extracted field at once:
+# - headline: first of the selectors whose first match has > 8 chars
+# - features: first 12 `ul li` items between 10 and 120 chars
+# - ctas: first 8 buttons/links under 40 chars
+# - body_text: visible body text, used for pricing detection
+EXTRACT_PAGE_SCRIPT = """
+() => {
+    const text = (el) => (el && el.innerText) || "";
+
+    let headline = "";
+    for (const sel of ["h1", "[class*='hero'] h1", "[class*='headline']"]) {
+        const value = text(document.querySelector(sel));
+        if (value.length > 8) {
+            headline = value.trim();
+            break;
+        }
+    }
+
+    const features = Array.from(document.querySelectorAll("ul li"))
+        .slice(0, 12)
+        .map(text)
+        .filter((value) => value.length > 10 && value.length < 120)
+        .map((value) => value.trim());
+
+    const ctas = Array.from(document.querySelectorAll("button, a"))
+        .slice(0, 8)
+        .map(text)
+        .filter((value) => value && value.length < 40)
+        .map((value) => value.trim());
+
+    return {
+        headline,
+        features,
+        ctas,
+        body_text: text(document.body)
+    };
+}
+"""
 
 
 class PlaywrightService:
 
+    def __init__(self):
+        # Which path served each scrape (static HTML vs headless browser)
+        self.served_counts = {"static": 0, "browser": 0}
+        self.static_escalations = 0
+
+    async def scrape_many(
+        self,
+        urls: Iterable[str],
+        concurrency: Optional[int] = None,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Scrape a batch of URLs across the shared browser.
+
+        - Inputs are deduplicated by url_fingerprint
+        - At most `concurrency` pages are scraped at once
+        - Results are yielded as soon as each scrape finishes
+        - URLs still running at the global `deadline` (seconds) are
+          cancelled and yielded as failures
+        """
+        concurrency = concurrency or settings.SCRAPE_CONCURRENCY
+        deadline = deadline or settings.SCRAPE_DEADLINE_SECONDS
+
+        unique = {}
+        for url in urls:
+            if url:
+                unique.setdefault(url_fingerprint(url), url)
+
+        if not unique:
+            return
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(url: str) -> Dict:
+            async with semaphore:
+                return await self.scrape_competitor(url)
+
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + deadline
+        tasks = {asyncio.create_task(bounded(url)): url for url in unique.values()}
+        pending = set(tasks)
+
+        try:
+            while pending:
+                remaining = deadline_at - loop.time()
+                if remaining <= 0:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    # One failed URL must not end the stream for the others
+                    if task.exception() is not None:
+                        url = tasks[task]
+                        yield {
+                            "url": url,
+                            "fingerprint": url_fingerprint(url),
+                            "success": False,
+                            "error": str(task.exception())
+                        }
+                        continue
+
+                    yield task.result()
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+        for task in pending:
+            url = tasks[task]
+            yield {
+                "url": url,
+                "fingerprint": url_fingerprint(url),
+                "success": False,
+                "error": f"Scrape deadline of {deadline:.0f}s exceeded"
+            }
+
     async def scrape_competitor(self, url: str) -> Dict:
+        """
+        Scrape a competitor landing page.
+
+        - Fresh entries in the scrape cache are returned directly
+        - Stale entries are revalidated with a conditional GET
+        - Otherwise a plain HTTP fetch is tried first, escalating to
+          headless Chromium when the static HTML looks empty or JS-gated
+        """
         fingerprint = url_fingerprint(url)
 
+        cached = None
+        if settings.SCRAPE_CACHE_ENABLED:
+            cached = await scrape_cache.lookup(fingerprint)
+
+            if cached and scrape_cache.is_fresh(cached):
+                scrape_cache.counts["fresh_hits"] += 1
+                return {**cached["payload"], "cache": "fresh"}
+
+        response = None
+        if settings.SCRAPE_STATIC_FIRST or cached:
+            response = await self._http_get(url, scrape_cache.validators(cached))
+
+        if cached and response is not None and response.status_code == 304:
+            scrape_cache.counts["revalidated"] += 1
+            await scrape_cache.touch(fingerprint)
+            return {**cached["payload"], "cache": "revalidated"}
+
+        if settings.SCRAPE_CACHE_ENABLED:
+            scrape_cache.counts["misses"] += 1
+
+        result = await self._scrape_uncached(url, fingerprint, response)
+
+        if result["success"] and settings.SCRAPE_CACHE_ENABLED:
+            headers = response.headers if response is not None else {}
+            await scrape_cache.store(
+                fingerprint,
+                url,
+                result,
+                etag=headers.get("etag"),
+                last_modified=headers.get("last-modified")
+            )
+
+        return result
+
+    async def _scrape_uncached(self, url: str, fingerprint: str, response: Optional[httpx.Response]) -> Dict:
+        if settings.SCRAPE_STATIC_FIRST:
+            payload = self._parse_static(response)
+            if payload is not None:
+                self.served_counts["static"] += 1
+                return self._build_result(url, fingerprint, payload, "static")
+
+            self.static_escalations += 1
+
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-
-                page.set_default_timeout(15000)
-                await page.set_extra_http_headers({
-                    "User-Agent": (
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/120.0.0.0 Safari/537.36"
-                    )
-                })
-
-                await page.goto(url, wait_until="domcontentloaded")
-                await page.wait_for_timeout(2000)
-
-                body_text = await page.inner_text("body")
-
-                data = {
-                    "url": url,
-                    "fingerprint": fingerprint,
-                    "success": True,
-                    "headline": await self._extract_headline(page),
-                    "pricing": self._extract_pricing(body_text),
-                    "features": await self._extract_features(page),
-                    "ctas": await self._extract_ctas(page),
-                }
-
-                await browser.close()
-                return data
+            payload = await self._fetch_browser(url)
+            self.served_counts["browser"] += 1
+            return self._build_result(url, fingerprint, payload, "browser")
 
         except Exception as e:
             return {
@@ -51,17 +207,115 @@ class PlaywrightService:
                 "error": str(e)
             }
 
-    async def _extract_headline(self, page) -> str:
-        selectors = ["h1", "[class*='hero'] h1", "[class*='headline']"]
-        for sel in selectors:
-            try:
-                el = page.locator(sel).first
-                text = await el.inner_text()
-                if text and len(text) > 8:
-                    return text.strip()
-            except:
-                continue
-        return "Not found"
+    def stats(self) -> dict:
+        total = sum(self.served_counts.values())
+        return {
+            "served": dict(self.served_counts),
+            "static_hit_rate": round(self.served_counts["static"] / total, 3) if total else None,
+            "static_escalations": self.static_escalations,
+            "cache": scrape_cache.stats()
+        }
+
+    def _build_result(self, url: str, fingerprint: str, payload: Dict, served_by: str) -> Dict:
+        return {
+            "url": url,
+            "fingerprint": fingerprint,
+            "success": True,
+            "served_by": served_by,
+            "headline": payload.get("headline") or "Not found",
+            "pricing": self._extract_pricing(payload.get("body_text") or ""),
+            "features": payload.get("features") or [],
+            "ctas": list(dict.fromkeys(payload.get("ctas") or [])),
+        }
+
+    async def _http_get(self, url: str, headers: Dict) -> Optional[httpx.Response]:
+        """
+        Plain GET over the shared HTTP client. Returns None on any error,
+        so the caller escalates to the browser.
+        """
+        try:
+            return await get_http_client().get(
+                url,
+                headers={**STATIC_HEADERS, **headers},
+                follow_redirects=True,
+                timeout=settings.SCRAPE_STATIC_TIMEOUT
+            )
+        except Exception:
+            # Not only httpx.HTTPError: malformed URLs raise httpx.InvalidURL
+            return None
+
+    def _parse_static(self, response: Optional[httpx.Response]) -> Optional[Dict]:
+        """
+        Parse server-rendered HTML.
+        Returns None when the page needs a real browser.
+        """
+        if response is None or response.status_code != 200:
+            return None
+
+        if "html" not in response.headers.get("content-type", ""):
+            return None
+
+        try:
+            payload = extract_landing_page(response.text)
+        except Exception:
+            return None
+
+        return payload if self._looks_complete(payload) else None
+
+    def _looks_complete(self, payload: Dict) -> bool:
+        """
+        Heuristic: is the static HTML good enough to skip the browser?
+        """
+        body_length = len(payload["body_text"])
+        min_text = settings.SCRAPE_STATIC_MIN_TEXT
+
+        if body_length < min_text:
+            return False
+
+        if not payload["headline"] and not payload["features"]:
+            return False
+
+        # A "please enable JavaScript" notice on a thin page means a client-rendered app
+        if payload["js_gated"] and body_length < 3 * min_text:
+            return False
+
+        return True
+
+    async def _fetch_browser(self, url: str) -> Dict:
+        # Pages come from the shared browser pool (no per-URL launch)
+        async with browser_pool.page() as page:
+            page.set_default_timeout(15000)
+
+            await page.goto(url, wait_until="domcontentloaded")
+            await self._wait_until_ready(page)
+
+            # One CDP round-trip for everything we extract
+            return await page.evaluate(EXTRACT_PAGE_SCRIPT)
+
+    async def _wait_until_ready(self, page):
+        """
+        Wait for the page to settle instead of sleeping a fixed time.
+
+        Returns as soon as the network goes idle or a headline is
+        visible, whichever comes first, and never waits longer than
+        SCRAPE_READY_CAP_MS.
+        """
+        cap = settings.SCRAPE_READY_CAP_MS
+        waits = [
+            asyncio.create_task(page.wait_for_load_state("networkidle", timeout=cap)),
+            asyncio.create_task(page.wait_for_selector("h1", timeout=cap)),
+        ]
+
+        try:
+            done, _ = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                # A timeout just means we stop waiting and extract what is there
+                task.exception()
+        finally:
+            for task in waits:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*waits, return_exceptions=True)
 
     def _extract_pricing(self, text: str) -> Dict:
         prices = re.findall(r'[$₹€£]\s*\d+', text)
@@ -71,29 +325,5 @@ class PlaywrightService:
             "has_free": "free" in text.lower()
         }
 
-    async def _extract_features(self, page) -> List[str]:
-        features = []
-        items = await page.locator("ul li").all()
-        for el in items[:12]:
-            try:
-                txt = await el.inner_text()
-                if 10 < len(txt) < 120:
-                    features.append(txt.strip())
-            except:
-                continue
-        return features
-
-    async def _extract_ctas(self, page) -> List[str]:
-        ctas = []
-        buttons = await page.locator("button, a").all()
-        for b in buttons[:8]:
-            try:
-                txt = await b.inner_text()
-                if txt and len(txt) < 40:
-                    ctas.append(txt.strip())
-            except:
-                continue
-        return list(dict.fromkeys(ctas))
-
 
 playwright_service = PlaywrightService()
@@ -5,9 +5,12 @@ Discovers competitors by searching Product Hunt for products
 in specific categories.
 """
 
-import requests
+import httpx
 from typing import List, Dict, Optional
+from app.core.cache import response_cache
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.rate_limiter import rate_limiter, retry_after
 
 
 class ProductHuntService:
@@ -35,7 +38,7 @@ class ProductHuntService:
         print("✅ Product Hunt service initialized")
 
     
-    def search_products(self, topic: str, limit: int = 20) -> List[Dict]:
+    async def search_products(self, topic: str, limit: int = 20) -> List[Dict]:
         """
         Search for products in a specific topic/category.
         
@@ -45,6 +48,10 @@ class ProductHuntService:
             
         Returns:
             List of product dictionaries
+
+        Raises:
+            The underlying error after logging it, so the collector can
+            report Product Hunt as missing instead of empty
         """
         
         print(f"\n{'='*50}")
@@ -86,72 +93,89 @@ class ProductHuntService:
         }
         
         try:
-            # Make API request
-            response = requests.post(
-                self.base_url,
-                json={"query": query, "variables": variables},
-                headers=self.headers,
-                timeout=10
+            # Repeat topic searches are served from the shared response cache
+            products = await response_cache.get_or_fetch(
+                "producthunt",
+                [topic, limit],
+                lambda: self._fetch_products(query, variables)
             )
             
-            # Check if request was successful
-            response.raise_for_status()
+            print(f"✅ Found {len(products)} products on Product Hunt\n")
             
-            # Parse response
-            data = response.json()
-            #FOR DEBUGGING
-            print(data)
+            # Show first 3 for debugging
+            for i, p in enumerate(products[:3], 1):
+                print(f"  {i}. {p['name']} - {p['votes']} upvotes")
             
-            # Extract products from GraphQL response
-            products = []
-            
-            if "data" in data and "posts" in data["data"]:
-                edges = data["data"]["posts"]["edges"]
-                
-                for edge in edges:
-                    node = edge["node"]
-                    
-                    # Extract topic names
-                    topics = []
-                    if "topics" in node:
-                        topics = [
-                            t["node"]["name"] 
-                            for t in node["topics"]["edges"]
-                        ]
-                    
-                    # Create clean product dictionary
-                    product = {
-                        "name": node.get("name", "Unknown"),
-                        "tagline": node.get("tagline", ""),
-                        "description": node.get("description", ""),
-                        "website": node.get("website", ""),
-                        "producthunt_url": node.get("url", ""),
-                        "votes": node.get("votesCount", 0),
-                        "created_at": node.get("createdAt", ""),
-                        "topics": topics,
-                        "data_source": "producthunt"
-                    }
-                    
-                    products.append(product)
-                
-                print(f"✅ Found {len(products)} products on Product Hunt\n")
-                
-                # Show first 3 for debugging
-                for i, p in enumerate(products[:3], 1):
-                    print(f"  {i}. {p['name']} - {p['votes']} upvotes")
-                
-                if len(products) > 3:
-                    print(f"  ... and {len(products) - 3} more\n")
+            if len(products) > 3:
+                print(f"  ... and {len(products) - 3} more\n")
             
             return products
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"❌ Product Hunt API error: {e}\n")
-            return []
+            raise
         
         except Exception as e:
-            print(f"❌ Unexpected error: {e}\n")
-            return []
+            print(f"❌ Unexpected error: {e!r}\n")
+            raise
+
+    async def _fetch_products(self, query: str, variables: Dict) -> List[Dict]:
+        """
+        Run the GraphQL query and parse products from the response.
+        """
+        # Make API request (async, does not block the event loop)
+        async with rate_limiter.limit("producthunt"):
+            response = await get_http_client().post(
+                self.base_url,
+                json={"query": query, "variables": variables},
+                headers=self.headers,
+                timeout=10
+            )
+
+        if response.status_code == 429:
+            rate_limiter.backoff("producthunt", retry_after(response))
+        
+        # Check if request was successful
+        response.raise_for_status()
+        
+        # Parse response
+        data = response.json()
+        #FOR DEBUGGING
+        print(data)
+        
+        # Extract products from GraphQL response
+        products = []
+        
+        if "data" in data and "posts" in data["data"]:
+            edges = data["data"]["posts"]["edges"]
+            
+            for edge in edges:
+                node = edge["node"]
+                
+                # Extract topic names
+                topics = []
+                if "topics" in node:
+                    topics = [
+                        t["node"]["name"] 
+                        for t in node["topics"]["edges"]
+                    ]
+                
+                # Create clean product dictionary
+                product = {
+                    "name": node.get("name", "Unknown"),
+                    "tagline": node.get("tagline", ""),
+                    "description": node.get("description", ""),
+                    "website": node.get("website", ""),
+                    "producthunt_url": node.get("url", ""),
+                    "votes": node.get("votesCount", 0),
+                    "created_at": node.get("createdAt", ""),
+                    "topics": topics,
+                    "data_source": "producthunt"
+                }
+                
+                products.append(product)
+        
+        return products
 
 
 # Create global instance
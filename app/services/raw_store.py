@@ -0,0 +1,84 @@
+# app/services/raw_store.py
+
+import json
+import zlib
+from datetime import datetime
+from typing import Optional
+
+from bson import Binary
+
+from app.core.config import settings
+from app.core.database import get_async_database
+
+try:
+    import zstandard
+except ImportError:  # Optional: falls back to zlib
+    zstandard = None
+
+
+class RawMarketDataStore:
+    """
+    Raw collector output, stored apart from the `analyses` document.
+
+    One document per job in `analysis_raw`, holding the market data as
+    compressed JSON (zstd when available, otherwise zlib). Loaded only
+    when a client explicitly asks for raw evidence.
+    """
+
+    def __init__(self, compression: str):
+        self.collection_name = "analysis_raw"
+        self.codec = self._pick_codec(compression)
+
+    async def save(self, job_id: str, market_data: dict):
+        raw = json.dumps(market_data, default=str).encode("utf-8")
+
+        await get_async_database()[self.collection_name].update_one(
+            {"job_id": job_id},
+            {"$set": {
+                "job_id": job_id,
+                "codec": self.codec,
+                "data": Binary(self._compress(raw)),
+                "raw_size": len(raw),
+                "stored_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+
+    async def load(self, job_id: str) -> Optional[dict]:
+        doc = await get_async_database()[self.collection_name].find_one({"job_id": job_id})
+        if not doc:
+            return None
+
+        return json.loads(self._decompress(doc["codec"], bytes(doc["data"])))
+
+    # --------------------------------------------------
+    # Codecs
+    # --------------------------------------------------
+    def _pick_codec(self, compression: str) -> str:
+        if compression == "zstd" and zstandard is None:
+            print("⚠️ zstandard not installed, raw market data will use zlib")
+            return "zlib"
+
+        if compression not in ("zstd", "zlib", "none"):
+            return "zlib"
+
+        return compression
+
+    def _compress(self, raw: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(raw)
+        if self.codec == "zlib":
+            return zlib.compress(raw, 6)
+        return raw
+
+    def _decompress(self, codec: str, data: bytes) -> bytes:
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read this raw market data")
+            return zstandard.ZstdDecompressor().decompress(data)
+        if codec == "zlib":
+            return zlib.decompress(data)
+        return data
+
+
+raw_store = RawMarketDataStore(compression=settings.RAW_STORE_COMPRESSION)
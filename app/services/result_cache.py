@@ -0,0 +1,115 @@
+# app/services/result_cache.py
+
+from datetime import datetime, timedelta
+from typing import Optional
+import uuid
+
+from app.core.config import settings
+from app.core.database import get_async_database
+from app.utils.fingerprint import idea_fingerprint
+
+
+# Fields copied from the source job when a cached job is read.
+# Raw market data is kept in the raw store under the source job_id.
+RESULT_FIELDS = ("base_analysis", "analysis", "partial", "missing_sources", "source_status")
+
+
+class ResultCache:
+    """
+    Analysis-level cache backed by the `analyses` collection.
+
+    A completed job is reused for any later request with the same
+    normalized idea and tier within the TTL. A hit mints a new job that
+    points at the source job via `source_job_id` instead of copying it.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+
+    async def lookup(self, product_idea: str, tier: str) -> Optional[dict]:
+        """
+        Find the most recent fresh, completed analysis for this idea.
+        """
+        db = get_async_database()
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+
+        return await db["analyses"].find_one(
+            {
+                "idea_fingerprint": idea_fingerprint(product_idea, tier),
+                "status": "complete",
+                "source_job_id": {"$exists": False},
+                # Deadline-cut results (a source_status of "deadline")
+                # are not worth serving again
+                "partial": {"$ne": True},
+                "completed_at": {"$gte": cutoff}
+            },
+            projection={"_id": 0, "job_id": 1, "analysis": 1},
+            sort=[("completed_at", -1)]
+        )
+
+    async def serve(self, product_idea: str, tier: str, email: str) -> Optional[dict]:
+        """
+        On a cache hit, create a completed job pointing at the cached
+        analysis and return it. Returns None on a miss.
+        """
+        source = await self.lookup(product_idea, tier)
+        if not source:
+            return None
+
+        db = get_async_database()
+        job_id = str(uuid.uuid4())
+        now = datetime.utcnow()
+
+        await db["analyses"].insert_one({
+            "job_id": job_id,
+            "email": email,
+            "product_idea": product_idea,
+            "tier": tier,
+            "idea_fingerprint": idea_fingerprint(product_idea, tier),
+            "status": "complete",
+            "progress": 100,
+            "source_job_id": source["job_id"],
+            "created_at": now,
+            "completed_at": now
+        })
+
+        print(f"⚡ Cache hit: {job_id} -> {source['job_id']}")
+
+        return {
+            "job_id": job_id,
+            "status": "complete",
+            "cached": True,
+            "analysis": source.get("analysis")
+        }
+
+    async def resolve(self, analysis: dict, projection: Optional[dict] = None) -> dict:
+        """
+        Fill in result fields for a job that points at a cached source.
+        With a projection, only the projected result fields are copied.
+        """
+        source_job_id = analysis.get("source_job_id")
+        if not source_job_id:
+            return analysis
+
+        fields = [
+            field for field in RESULT_FIELDS
+            if projection is None or projection.get(field)
+        ]
+        if not fields:
+            return analysis
+
+        db = get_async_database()
+        source = await db["analyses"].find_one(
+            {"job_id": source_job_id},
+            projection={field: 1 for field in fields}
+        )
+
+        if source:
+            for field in fields:
+                if field in source:
+                    analysis[field] = source[field]
+
+        return analysis
+
+
+result_cache = ResultCache(ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS)
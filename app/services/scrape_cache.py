@@ -0,0 +1,83 @@
+# app/services/scrape_cache.py
+
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.database import get_async_database
+
+
+class ScrapeCache:
+    """
+    Persistent cache of competitor scrapes, keyed by url_fingerprint.
+
+    Stores the extracted payload together with the page's ETag /
+    Last-Modified validators. Fresh entries are served as-is; stale
+    ones can be revalidated with a conditional GET instead of a full
+    re-scrape.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.collection_name = "scrapes"
+        self.counts = {"fresh_hits": 0, "revalidated": 0, "misses": 0}
+
+    async def lookup(self, fingerprint: str) -> Optional[Dict]:
+        try:
+            return await get_async_database()[self.collection_name].find_one(
+                {"fingerprint": fingerprint},
+                projection={"_id": 0}
+            )
+        except Exception as e:
+            print(f"⚠️ Scrape cache read failed: {e}")
+            return None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        return entry["fetched_at"] >= cutoff
+
+    def validators(self, entry: Optional[Dict]) -> Dict:
+        """
+        Conditional request headers for a cached entry.
+        """
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    async def store(self, fingerprint: str, url: str, payload: Dict, etag: Optional[str], last_modified: Optional[str]):
+        await self._upsert(fingerprint, {
+            "fingerprint": fingerprint,
+            "url": url,
+            "payload": payload,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": datetime.utcnow()
+        })
+
+    async def touch(self, fingerprint: str):
+        """
+        Mark a revalidated (304 Not Modified) entry as fresh again.
+        """
+        await self._upsert(fingerprint, {"fetched_at": datetime.utcnow()})
+
+    def stats(self) -> dict:
+        return {"ttl_seconds": self.ttl_seconds, **self.counts}
+
+    async def _upsert(self, fingerprint: str, fields: Dict):
+        try:
+            await get_async_database()[self.collection_name].update_one(
+                {"fingerprint": fingerprint},
+                {"$set": fields},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"⚠️ Scrape cache write failed: {e}")
+
+
+scrape_cache = ScrapeCache(ttl_seconds=settings.SCRAPE_CACHE_TTL_SECONDS)
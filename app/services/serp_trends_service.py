@@ -6,14 +6,16 @@ Infers market momentum using search intent signals.
 from dotenv import load_dotenv
 load_dotenv()
 
-from serpapi import GoogleSearch
 from typing import Dict, List
 from app.services.query_transformer import generate_queries
+from app.core.cache import response_cache
 from app.core.config import settings
+from app.core.hedging import request_hedger
+from app.core.http_client import get_http_client
+from app.core.rate_limiter import rate_limiter, retry_after
 
-import time
-import os
-import requests
+import asyncio
+import httpx
 
 
 class SerpTrendsService:
@@ -25,12 +27,13 @@ class SerpTrendsService:
     def __init__(self):
         self.api_key = settings.SERPAPI_KEY
         self.base_url = "https://serpapi.com/search.json"
+
         if not self.api_key:
             print("⚠️ SERPAPI_KEY not found in environment")
         
         print("✅ SerpAPI Trends service initialized")
 
-    def _run_serp_query(self, query: str) -> dict:
+    async def _run_serp_query(self, query: str) -> dict:
         """
         Run a single SerpAPI Google search query
         and extract useful market signals.
@@ -40,7 +43,15 @@ class SerpTrendsService:
         if not self.api_key:
             print("❌ No SerpAPI key configured")
             return {}
-        
+
+        # Repeat queries are served from the shared response cache
+        return await response_cache.get_or_fetch(
+            "serpapi",
+            [query],
+            lambda: self._fetch(query)
+        )
+
+    async def _fetch(self, query: str) -> dict:
         params = {
             "engine": "google",
             "q": query,
@@ -49,12 +60,18 @@ class SerpTrendsService:
         }
 
         try:
-            response = requests.get(
-                self.base_url, 
-                params=params, 
-                timeout=20
+            # Searches are idempotent, so slow ones are hedged with a second
+            # request; each attempt is paced by the SerpAPI rate limiter
+            response = await request_hedger.run(
+                "serpapi",
+                lambda: self._get(params),
+                default_timeout=20
             )
 
+            if response.status_code == 429:
+                rate_limiter.backoff("serpapi", retry_after(response))
+                return {}
+
             if response.status_code != 200:
                 print(f"⚠️ SerpAPI returned status {response.status_code}")
                 return {}
@@ -91,14 +108,25 @@ class SerpTrendsService:
                 "related_searches": related_searches,
             }
             
-        except requests.RequestException as e:
+        except asyncio.TimeoutError:
+            print(f"⚠️ SerpAPI timed out for: {query}")
+            return {}
+        except httpx.HTTPError as e:
             print(f"❌ Network error: {e}")
             return {}
         except Exception as e:
             print(f"❌ Unexpected error: {e}")
             return {}
 
-    def analyze_keyword(self, user_input: str) -> dict:
+    async def _get(self, params: dict) -> httpx.Response:
+        # The hedger holds a rate limiter slot around each attempt
+        return await get_http_client().get(
+            self.base_url, 
+            params=params,
+            timeout=20
+        )
+
+    async def analyze_keyword(self, user_input: str) -> dict:
         """
         Analyze search trends for a user's product idea.
         
@@ -122,23 +150,21 @@ class SerpTrendsService:
                 print(f"   - {q}")
             print()
 
-            all_results = []
+            # All queries in flight at once, paced by the provider rate limiter
+            responses = await asyncio.gather(*(
+                self._run_serp_query(query) for query in queries
+            ))
 
-            for i, query in enumerate(queries):
-                print(f"🔍 Querying: {query}")
-                
-                data = self._run_serp_query(query)
+            all_results = []
 
+            for query, data in zip(queries, responses):
                 if not data:
-                    print(f"   ⚠️ No data returned\n")
+                    print(f"   ⚠️ {query}: no data returned")
                     continue
                 
-                print(f"   ✅ Got {data['result_count']:,} results\n")
+                print(f"   ✅ {query}: {data['result_count']:,} results")
                 all_results.append(data)
-                
-                # Rate limiting (avoid hitting API limits)
-                if i < len(queries) - 1:  # Don't wait after last query
-                    time.sleep(2)
+            print()
 
             if not all_results:
                 return {
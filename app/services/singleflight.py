@@ -0,0 +1,274 @@
+# app/services/singleflight.py
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.core.database import get_async_database
+from app.services.job_state import job_state
+from app.utils.fingerprint import idea_fingerprint
+
+
+# Job statuses after which a leader will not change again
+TERMINAL_STATUSES = ("complete", "failed")
+
+
+class AnalysisSingleflight:
+    """
+    In-flight deduplication of identical analyses.
+
+    The first request for a normalized idea + tier becomes the leader
+    and runs the pipeline. Identical requests arriving while it runs
+    become followers: their job records point at the leader through
+    `leader_job_id` and are settled with the leader's outcome (as a
+    `source_job_id` pointer on success) when it finishes.
+
+    Leaders are tracked in-process. With SINGLEFLIGHT_MONGO_LEASE a
+    lease document per idea also lets other workers join a leader
+    running elsewhere; leases expire after `lease_seconds`.
+    """
+
+    def __init__(self, lease_seconds: int, poll_seconds: float, mongo_lease: bool = False):
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.mongo_lease = mongo_lease
+        self.collection_name = "analysis_leases"
+
+        # fingerprint -> leader job_id
+        self._leaders: dict = {}
+        # leader job_id -> fingerprint
+        self._fingerprints: dict = {}
+        # leader job_id -> Future resolved with the outcome
+        self._outcomes: dict = {}
+
+        self._followers_joined = 0
+
+    async def join(self, product_idea: str, tier: str, job_id: str) -> Optional[str]:
+        """
+        Register `job_id` for this idea. Returns the leader's job_id when
+        an identical analysis is already running, or None when `job_id`
+        is now the leader and should run the pipeline.
+        """
+        fingerprint = idea_fingerprint(product_idea, tier)
+
+        leader_job_id = self._leaders.get(fingerprint)
+        if leader_job_id is None and self.mongo_lease:
+            leader_job_id = await self._claim_lease(fingerprint, job_id)
+
+        if leader_job_id is None:
+            self._leaders[fingerprint] = job_id
+            self._fingerprints[job_id] = fingerprint
+            self._outcomes[job_id] = asyncio.get_running_loop().create_future()
+            return None
+
+        self._followers_joined += 1
+        db = get_async_database()
+        await db["analyses"].update_one(
+            {"job_id": job_id},
+            {"$set": {"leader_job_id": leader_job_id}}
+        )
+
+        # The leader may have finished while we were registering
+        leader = await self._read_leader(leader_job_id)
+        if leader and leader.get("status") in TERMINAL_STATUSES:
+            await self._settle_followers(leader_job_id, leader)
+
+        print(f"🔗 Job {job_id} joined running analysis {leader_job_id}")
+        return leader_job_id
+
+    async def release(self, job_id: str, outcome: dict):
+        """
+        Called by the leader once its job reached a terminal state.
+        `outcome` carries status plus analysis or error.
+
+        Never raises: the in-process leader is always cleared and waiting
+        followers always resolved; the follower records and the lease
+        are updated best-effort.
+        """
+        fingerprint = self._fingerprints.pop(job_id, None)
+        if fingerprint is None:
+            return  # Not a leader (or already released)
+
+        if self._leaders.get(fingerprint) == job_id:
+            del self._leaders[fingerprint]
+
+        future = self._outcomes.pop(job_id, None)
+        if future is not None and not future.done():
+            future.set_result(outcome)
+
+        try:
+            await self._settle_followers(job_id, outcome)
+        except Exception as e:
+            print(f"⚠️ Could not settle followers of {job_id}: {e}")
+
+        if self.mongo_lease:
+            try:
+                await get_async_database()[self.collection_name].delete_one(
+                    {"_id": fingerprint, "job_id": job_id}
+                )
+            except Exception as e:
+                # The lease still expires on its own
+                print(f"⚠️ Could not delete analysis lease for {job_id}: {e}")
+
+    async def wait(self, job_id: str, leader_job_id: str) -> dict:
+        """
+        Wait for the leader to finish and return its result as `job_id`'s.
+        Gives up after `lease_seconds`, like waiting on another worker.
+        """
+        future = self._outcomes.get(leader_job_id)
+        if future is not None:
+            try:
+                outcome = await asyncio.wait_for(asyncio.shield(future), timeout=self.lease_seconds)
+            except asyncio.TimeoutError:
+                outcome = {"status": "failed", "error": "Timed out waiting for joined analysis"}
+        else:
+            outcome = await self._poll_leader(leader_job_id)
+
+        if outcome.get("status") != "complete":
+            raise Exception(outcome.get("error") or "Joined analysis failed")
+
+        return {
+            "job_id": job_id,
+            "status": "complete",
+            "deduplicated": True,
+            "source_job_id": leader_job_id,
+            "partial": outcome.get("partial", False),
+            "missing_sources": outcome.get("missing_sources", []),
+            "analysis": outcome.get("analysis")
+        }
+
+    async def mirror_leader(self, doc: dict, projection: Optional[dict] = None) -> dict:
+        """
+        Show a running follower with its leader's status and progress.
+        """
+        leader_job_id = doc.get("leader_job_id")
+        if not leader_job_id or doc.get("status") in TERMINAL_STATUSES:
+            return doc
+
+        leader = await self._read_leader(leader_job_id)
+        if not leader:
+            return doc
+
+        for field in ("status", "progress", "phase"):
+            if field in leader and (projection is None or projection.get(field)):
+                doc[field] = leader[field]
+
+        return doc
+
+    async def stream_target(self, job_id: str) -> str:
+        """
+        Job whose events a stream should follow: the leader while a
+        follower is still waiting, otherwise the job itself.
+        """
+        doc = await get_async_database()["analyses"].find_one(
+            {"job_id": job_id},
+            projection={"_id": 0, "status": 1, "leader_job_id": 1}
+        )
+
+        if doc and doc.get("leader_job_id") and doc.get("status") not in TERMINAL_STATUSES:
+            return doc["leader_job_id"]
+        return job_id
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._leaders),
+            "followers_joined": self._followers_joined,
+            "mongo_lease": self.mongo_lease
+        }
+
+    # --------------------------------------------------
+    # Internals
+    # --------------------------------------------------
+    async def _claim_lease(self, fingerprint: str, job_id: str) -> Optional[str]:
+        """
+        Try to become the cross-worker leader for this idea.
+        Returns the current leader's job_id if someone else holds the lease.
+        """
+        leases = get_async_database()[self.collection_name]
+        now = datetime.utcnow()
+        lease = {"job_id": job_id, "expires_at": now + timedelta(seconds=self.lease_seconds)}
+
+        try:
+            await leases.insert_one({"_id": fingerprint, **lease})
+            return None
+        except DuplicateKeyError:
+            pass
+
+        # Take over an expired lease (e.g. its worker died)
+        taken = await leases.update_one(
+            {"_id": fingerprint, "expires_at": {"$lt": now}},
+            {"$set": lease}
+        )
+        if taken.modified_count:
+            return None
+
+        current = await leases.find_one({"_id": fingerprint})
+        return current["job_id"] if current else None
+
+    async def _read_leader(self, leader_job_id: str) -> Optional[dict]:
+        leader = await get_async_database()["analyses"].find_one(
+            {"job_id": leader_job_id},
+            projection={
+                "_id": 0, "job_id": 1, "status": 1, "progress": 1, "phase": 1,
+                "error": 1, "partial": 1, "missing_sources": 1
+            }
+        )
+        return job_state.overlay(leader) if leader else None
+
+    async def _poll_leader(self, leader_job_id: str) -> dict:
+        """
+        Wait for a leader running on another worker.
+        """
+        db = get_async_database()
+        deadline = asyncio.get_running_loop().time() + self.lease_seconds
+
+        while asyncio.get_running_loop().time() < deadline:
+            leader = await db["analyses"].find_one(
+                {"job_id": leader_job_id},
+                projection={"_id": 0, "status": 1, "error": 1, "analysis": 1, "partial": 1, "missing_sources": 1}
+            )
+
+            if not leader:
+                return {"status": "failed", "error": "Joined analysis disappeared"}
+            if leader.get("status") in TERMINAL_STATUSES:
+                return leader
+
+            await asyncio.sleep(self.poll_seconds)
+
+        return {"status": "failed", "error": "Timed out waiting for joined analysis"}
+
+    async def _settle_followers(self, leader_job_id: str, outcome: dict):
+        now = datetime.utcnow()
+
+        if outcome.get("status") == "complete":
+            fields = {
+                "status": "complete",
+                "progress": 100,
+                "phase": "complete",
+                "source_job_id": leader_job_id,
+                "partial": outcome.get("partial", False),
+                "missing_sources": outcome.get("missing_sources", []),
+                "completed_at": now
+            }
+        else:
+            fields = {
+                "status": "failed",
+                "phase": "failed",
+                "error": outcome.get("error"),
+                "completed_at": now
+            }
+
+        await get_async_database()["analyses"].update_many(
+            {"leader_job_id": leader_job_id, "status": {"$nin": list(TERMINAL_STATUSES)}},
+            {"$set": fields}
+        )
+
+
+singleflight = AnalysisSingleflight(
+    lease_seconds=settings.SINGLEFLIGHT_LEASE_SECONDS,
+    poll_seconds=settings.SINGLEFLIGHT_POLL_SECONDS,
+    mongo_lease=settings.SINGLEFLIGHT_MONGO_LEASE
+)
@@ -1,79 +1,112 @@
 # app/services/tavily_service.py
 
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient
+from tavily.errors import UsageLimitExceededError
+from app.core.cache import response_cache
 from app.core.config import settings
+from app.core.hedging import request_hedger
+from app.core.http_client import build_client
+from app.core.rate_limiter import rate_limiter
 
 
 class TavilyService:
     def __init__(self):
-        self.client = TavilyClient(
-            api_key=settings.TAVILY_API_KEY.strip()
+        # Async client: searches run as real async I/O on the event loop.
+        # The SDK sets its own auth headers and base URL on the client it
+        # is given, so it gets a dedicated pooled client rather than the
+        # shared one.
+        self._http = build_client()
+        self.client = AsyncTavilyClient(
+            api_key=settings.TAVILY_API_KEY.strip(),
+            client=self._http
         )
 
     async def search_competitors(self, product_idea: str, max_results: int = 15):
         """
         Search for direct competitors using Tavily.
         Returns companies/products that compete in the same space.
+        Errors are logged and re-raised so the collector can report
+        the source as missing instead of empty.
         """
         try:
             # Create competitor-focused search query
             competitor_query = f"{product_idea} competitors alternatives similar products tools"
-            
+
             print(f"🔍 Searching for competitors with Tavily...")
-            
-            response = self.client.search(
-                query=competitor_query,
-                search_depth="advanced",
-                max_results=max_results,
-                include_raw_content=True
-            )
 
-            competitors = []
-            for item in response.get("results", []):
-                competitors.append({
-                    "title": item.get("title"),
-                    "url": item.get("url"),
-                    "content": item.get("content", "")[:2000],
-                    "score": item.get("score", 0)
-                })
+            competitors = await self._search(competitor_query, max_results)
 
             print(f"✅ Found {len(competitors)} potential competitors from Tavily")
             return competitors
 
         except Exception as e:
-            print("❌ Tavily competitor search failed:", e)
-            return []
+            print("❌ Tavily competitor search failed:", repr(e))
+            raise
 
     async def search_market_signals(self, query: str, max_results: int = 10):
         """
         Fetch broad market intelligence from the web.
         This includes blogs, tools, communities, discussions, etc.
+        Errors are logged and re-raised, as for competitor searches.
         """
         try:
             print(f"🔍 Searching for market signals with Tavily...")
-            
-            response = self.client.search(
-                query=query,
-                search_depth="advanced",
-                max_results=max_results,
-                include_raw_content=True
-            )
 
-            results = []
-            for item in response.get("results", []):
-                results.append({
-                    "title": item.get("title"),
-                    "url": item.get("url"),
-                    "content": item.get("content", "")[:2000],
-                    "score": item.get("score", 0)
-                })
+            results = await self._search(query, max_results)
 
             print(f"✅ Found {len(results)} market signals from Tavily")
             return results
 
         except Exception as e:
-            print("❌ Tavily search failed:", e)
-            return []
+            print("❌ Tavily search failed:", repr(e))
+            raise
+
+    async def _search(self, query: str, max_results: int) -> list:
+        """
+        Run a Tavily search through the shared response cache.
+        """
+        return await response_cache.get_or_fetch(
+            "tavily",
+            [query, max_results],
+            lambda: self._fetch(query, max_results)
+        )
+
+    async def _fetch(self, query: str, max_results: int) -> list:
+        # Searches are idempotent, so slow ones are hedged with a second
+        # request; each attempt is rate limited by the hedger
+        response = await request_hedger.run(
+            "tavily",
+            lambda: self._search_once(query, max_results),
+            default_timeout=settings.COLLECTOR_TAVILY_TIMEOUT
+        )
+
+        results = []
+        for item in response.get("results", []):
+            results.append({
+                "title": item.get("title"),
+                "url": item.get("url"),
+                "content": item.get("content", "")[:2000],
+                "score": item.get("score", 0)
+            })
+
+        return results
+
+    async def _search_once(self, query: str, max_results: int) -> dict:
+        # The hedger holds a rate limiter slot around each attempt
+        try:
+            return await self.client.search(
+                query=query,
+                search_depth="advanced",
+                max_results=max_results,
+                include_raw_content=True
+            )
+        except UsageLimitExceededError:
+            # Tavily answers 429 with this error
+            rate_limiter.backoff("tavily")
+            raise
+
+    async def close(self):
+        await self._http.aclose()
 
 
-tavily_service = TavilyService()
\ No newline at end of file
+tavily_service = TavilyService()
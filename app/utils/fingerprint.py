@@ -1,10 +1,22 @@
 # app/utils/fingerprint.py
 
+import hashlib
 from urllib.parse import urlparse
 
+from app.services.query_transformer import normalize_input
+
+
 def url_fingerprint(url: str) -> str:
     """
     Normalize URL to avoid duplicate scraping.
     """
     parsed = urlparse(url.lower())
     return f"{parsed.scheme}://{parsed.netloc}{parsed.path}".rstrip("/")
+
+
+def idea_fingerprint(product_idea: str, tier: str) -> str:
+    """
+    Normalize a product idea + tier to detect repeated analyses.
+    """
+    key = f"{tier}:{normalize_input(product_idea)}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
@@ -0,0 +1,161 @@
+# app/utils/html_extractor.py
+
+from html.parser import HTMLParser
+
+
+# Elements that never have a closing tag
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr"
+}
+
+# Elements whose text is never visible
+HIDDEN_ELEMENTS = {"script", "style", "template", "head", "noscript"}
+
+# Phrases that mean the real content needs JavaScript
+JS_GATE_PHRASES = (
+    "enable javascript",
+    "javascript is required",
+    "javascript is disabled",
+    "requires javascript",
+    "you need to enable javascript",
+)
+
+
+class _LandingPageParser(HTMLParser):
+    """
+    Tolerant single-pass parser collecting the same fields as the
+    in-browser extraction script (headline candidates, list items,
+    CTAs and visible body text).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []
+        self.h1 = []
+        self.hero_h1 = []
+        self.headline = []
+        self.features = []
+        self.ctas = []
+        self.body_text = []
+        self.noscript_text = []
+
+    def handle_starttag(self, tag, attrs):
+        self._boundary()
+
+        if tag in VOID_ELEMENTS:
+            return
+
+        # <li> and <p> are often left unclosed
+        if tag in ("li", "p") and self.stack and self.stack[-1]["tag"] == tag:
+            self._close(len(self.stack) - 1)
+
+        classes = (dict(attrs).get("class") or "").lower()
+        ancestors = [entry["tag"] for entry in self.stack]
+
+        # Names of the result lists this element's text goes into
+        captures = []
+        if tag == "h1":
+            captures.append("h1")
+            if any("hero" in entry["classes"] for entry in self.stack):
+                captures.append("hero_h1")
+        if "headline" in classes:
+            captures.append("headline")
+        if tag == "li" and "ul" in ancestors:
+            captures.append("features")
+        if tag in ("button", "a"):
+            captures.append("ctas")
+
+        # Reserve each result slot now so results keep document order
+        # (the browser's querySelectorAll order), not closing order
+        slots = []
+        for field in captures:
+            results = getattr(self, field)
+            slots.append((results, len(results)))
+            results.append("")
+
+        self.stack.append({
+            "tag": tag,
+            "classes": classes,
+            "captures": captures,
+            "slots": slots,
+            "text": []
+        })
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags carry no text
+        return
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i]["tag"] == tag:
+                self._close(i)
+                return
+
+    def handle_data(self, data):
+        tags = {entry["tag"] for entry in self.stack}
+
+        if "noscript" in tags:
+            self.noscript_text.append(data)
+
+        if tags & HIDDEN_ELEMENTS:
+            return
+
+        self.body_text.append(data)
+        for entry in self.stack:
+            if entry["captures"]:
+                entry["text"].append(data)
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self._close(len(self.stack) - 1)
+
+    def _boundary(self):
+        # Tags separate words ("text<ul><li>item" is two words), both in
+        # the body text and in every element capturing text
+        self.body_text.append(" ")
+        for entry in self.stack:
+            if entry["captures"]:
+                entry["text"].append(" ")
+
+    def _close(self, index: int):
+        # Closing an element implicitly closes everything opened inside it
+        while len(self.stack) > index:
+            entry = self.stack.pop()
+            self._boundary()
+            if not entry["captures"]:
+                continue
+
+            text = " ".join("".join(entry["text"]).split())
+            for results, slot in entry["slots"]:
+                results[slot] = text
+
+
+def extract_landing_page(html: str) -> dict:
+    """
+    Extract headline, features, CTAs and body text from static HTML,
+    following the same rules as the browser extraction.
+    """
+    parser = _LandingPageParser()
+    parser.feed(html)
+    parser.close()
+
+    headline = ""
+    for candidates in (parser.h1, parser.hero_h1, parser.headline):
+        if candidates and len(candidates[0]) > 8:
+            headline = candidates[0]
+            break
+
+    features = [text for text in parser.features[:12] if 10 < len(text) < 120]
+    ctas = [text for text in parser.ctas[:8] if text and len(text) < 40]
+    body_text = " ".join("".join(parser.body_text).split())
+    noscript_text = " ".join(parser.noscript_text).lower()
+
+    return {
+        "headline": headline,
+        "features": features,
+        "ctas": ctas,
+        "body_text": body_text,
+        "js_gated": any(phrase in noscript_text or phrase in body_text.lower()[:2000] for phrase in JS_GATE_PHRASES)
+    }
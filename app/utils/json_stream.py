@@ -0,0 +1,80 @@
+# app/utils/json_stream.py
+
+import json
+
+
+class IncrementalObjectParser:
+    """
+    Incrementally parse the top-level members of a streamed JSON object.
+
+    Feed raw text chunks as they arrive; every call returns the
+    (key, value) pairs that became complete with that chunk. Anything
+    before the opening brace (e.g. a stray ```json fence) is ignored.
+    """
+
+    def __init__(self):
+        self._member = []
+        self._started = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> list:
+        completed = []
+
+        for ch in chunk:
+            if self._done:
+                break
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._member.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+
+            elif ch in "{[":
+                self._depth += 1
+
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    # Closing brace of the top-level object
+                    self._emit(completed)
+                    self._done = True
+                    continue
+
+            elif ch == "," and self._depth == 1:
+                self._emit(completed)
+                continue
+
+            self._member.append(ch)
+
+        return completed
+
+    def _emit(self, completed: list):
+        text = "".join(self._member).strip()
+        self._member = []
+
+        if not text:
+            return
+
+        try:
+            member = json.loads("{" + text + "}")
+        except json.JSONDecodeError:
+            return
+
+        completed.extend(member.items())
@@ -0,0 +1,142 @@
+"""
+Test the static landing page extractor used before falling back to the browser.
+Fixed inputs, no network.
+"""
+
+from app.utils.html_extractor import extract_landing_page
+
+
+def test_headline_and_ctas():
+    html = """
+    <html><head><title>Ignored title</title></head>
+    <body>
+      <h1>Plan your week in minutes</h1>
+      <a href="/signup">Start free trial</a>
+      <button>Book a demo</button>
+    </body></html>
+    """
+    page = extract_landing_page(html)
+
+    assert page["headline"] == "Plan your week in minutes", page["headline"]
+    assert page["ctas"] == ["Start free trial", "Book a demo"], page["ctas"]
+    assert "Ignored title" not in page["body_text"]
+    print("✅ Headline and CTAs extracted, <head> text hidden")
+
+
+def test_headline_fallbacks():
+    html = """
+    <h1>Hi</h1>
+    <div class="hero"><h1>Too</h1></div>
+    <p class="Headline-main">Scheduling that <b>actually</b> works</p>
+    """
+    page = extract_landing_page(html)
+
+    # Short first h1 is skipped in favour of the headline class
+    assert page["headline"] == "Scheduling that actually works", page["headline"]
+    print("✅ Short h1 falls back to the headline class")
+
+
+def test_unclosed_list_items():
+    html = """
+    <ul>
+      <li>Automatic calendar blocking
+      <li>Smart task prioritisation
+      <li>Short
+    </ul>
+    <ol><li>Ordered lists are not features</li></ol>
+    """
+    page = extract_landing_page(html)
+
+    assert page["features"] == [
+        "Automatic calendar blocking",
+        "Smart task prioritisation"
+    ], page["features"]
+    print("✅ Unclosed <li> items split, short and <ol> items dropped")
+
+
+def test_nested_lists():
+    html = """
+    <ul>
+      <li>Team workspaces
+        <ul><li>Shared project boards</li></ul>
+      </li>
+      <li>Calendar sync for everyone</li>
+    </ul>
+    """
+    page = extract_landing_page(html)
+
+    # Document order, as the browser's querySelectorAll returns them
+    assert page["features"] == [
+        "Team workspaces Shared project boards",
+        "Shared project boards",
+        "Calendar sync for everyone"
+    ], page["features"]
+    print("✅ Nested list items captured in document order")
+
+
+def test_nested_menu_does_not_reorder_features():
+    items = "".join(f"<li>Feature number {i:02d}</li>" for i in range(12))
+    html = f"""
+    <ul>
+      <li>Products menu<ul><li>Submenu entry one</li><li>Submenu entry two</li></ul></li>
+      {items}
+    </ul>
+    """
+    page = extract_landing_page(html)
+
+    assert page["features"][:3] == [
+        "Products menu Submenu entry one Submenu entry two",
+        "Submenu entry one",
+        "Submenu entry two"
+    ], page["features"]
+    assert page["features"][-1] == "Feature number 08", page["features"]
+    print("✅ [:12] keeps the first twelve items in document order")
+
+
+def test_hidden_text_and_entities():
+    html = """
+    <body>
+      <script>var secret = "not visible";</script>
+      <style>.x { color: red }</style>
+      <p>Tom &amp; Jerry&#39;s <br>favourite&nbsp;tool<img src="x.png"></p>
+    </body>
+    """
+    page = extract_landing_page(html)
+
+    assert "secret" not in page["body_text"]
+    assert "color" not in page["body_text"]
+    assert page["body_text"] == "Tom & Jerry's favourite tool", repr(page["body_text"])
+    print("✅ Script/style hidden, entities decoded, void elements ignored")
+
+
+def test_js_gate_detection():
+    gated = extract_landing_page(
+        "<noscript>You need to enable JavaScript to run this app.</noscript><div id='root'></div>"
+    )
+    plain = extract_landing_page("<p>Works without any scripts at all.</p>")
+
+    assert gated["js_gated"] is True
+    assert gated["body_text"] == ""
+    assert plain["js_gated"] is False
+    print("✅ JavaScript gate detected from <noscript>")
+
+
+def test_unclosed_document():
+    page = extract_landing_page("<div><h1>Unclosed headline text<ul><li>Unclosed feature item")
+
+    assert page["headline"] == "Unclosed headline text Unclosed feature item", page["headline"]
+    assert page["features"] == ["Unclosed feature item"], page["features"]
+    print("✅ Elements left open at the end of the document are closed")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing extract_landing_page ===\n")
+    test_headline_and_ctas()
+    test_headline_fallbacks()
+    test_unclosed_list_items()
+    test_nested_lists()
+    test_nested_menu_does_not_reorder_features()
+    test_hidden_text_and_entities()
+    test_js_gate_detection()
+    test_unclosed_document()
+    print("\n✅ All HTML extractor tests passed\n")
@@ -0,0 +1,112 @@
+"""
+Test the incremental JSON object parser used for streamed Gemini output.
+Fixed inputs, no API calls.
+"""
+
+from app.utils.json_stream import IncrementalObjectParser
+
+
+def parse_in_chunks(text: str, size: int) -> list:
+    parser = IncrementalObjectParser()
+    members = []
+    for i in range(0, len(text), size):
+        members.extend(parser.feed(text[i:i + size]))
+    return members
+
+
+def test_members_in_order():
+    text = '{"a": 1, "b": "two", "c": [1, 2, 3]}'
+    members = parse_in_chunks(text, len(text))
+
+    assert members == [("a", 1), ("b", "two"), ("c", [1, 2, 3])], members
+    print("✅ Members emitted in order")
+
+
+def test_any_chunk_size():
+    text = '{"overview": "Short, sharp", "risks": {"items": ["x", "y"], "level": "high"}}'
+    expected = [
+        ("overview", "Short, sharp"),
+        ("risks", {"items": ["x", "y"], "level": "high"})
+    ]
+
+    for size in range(1, len(text) + 1):
+        members = parse_in_chunks(text, size)
+        assert members == expected, (size, members)
+    print("✅ Same members for every chunk size")
+
+
+def test_members_emitted_as_soon_as_complete():
+    parser = IncrementalObjectParser()
+
+    assert parser.feed('{"a": 1, "b": ') == [("a", 1)]
+    assert parser.feed('[1, 2') == []
+    assert parser.feed(']}') == [("b", [1, 2])]
+    print("✅ Members emitted as soon as they are complete")
+
+
+def test_code_fence_ignored():
+    text = '```json\n{"a": {"b": 1}}\n```'
+    members = parse_in_chunks(text, 3)
+
+    assert members == [("a", {"b": 1})], members
+    print("✅ Code fence around the object ignored")
+
+
+def test_escapes_and_structural_chars_in_strings():
+    text = r'{"quote": "say \"hi\", {ok}", "path": "C:\\dir\\", "after": true}'
+    members = parse_in_chunks(text, 1)
+
+    assert members == [
+        ("quote", 'say "hi", {ok}'),
+        ("path", "C:\\dir\\"),
+        ("after", True)
+    ], members
+    print("✅ Escapes, commas and braces inside strings handled")
+
+
+def test_nested_commas_do_not_split():
+    text = '{"a": {"x": 1, "y": [{"z": 2}, {"z": 3}]}, "b": null}'
+    members = parse_in_chunks(text, 4)
+
+    assert members == [
+        ("a", {"x": 1, "y": [{"z": 2}, {"z": 3}]}),
+        ("b", None)
+    ], members
+    print("✅ Nested commas do not split members")
+
+
+def test_invalid_member_skipped():
+    text = '{"a": 1, "b": nope, "c": 3}'
+    members = parse_in_chunks(text, 5)
+
+    assert members == [("a", 1), ("c", 3)], members
+    print("✅ Invalid member skipped, the rest still parsed")
+
+
+def test_text_after_object_ignored():
+    parser = IncrementalObjectParser()
+
+    assert parser.feed('{"a": 1}') == [("a", 1)]
+    assert parser.feed(', "b": 2}') == []
+    print("✅ Text after the closing brace ignored")
+
+
+def test_truncated_stream():
+    members = parse_in_chunks('{"a": 1, "b": "unfinish', 4)
+
+    assert members == [("a", 1)], members
+    print("✅ Truncated stream keeps only complete members")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing IncrementalObjectParser ===\n")
+    test_members_in_order()
+    test_any_chunk_size()
+    test_members_emitted_as_soon_as_complete()
+    test_code_fence_ignored()
+    test_escapes_and_structural_chars_in_strings()
+    test_nested_commas_do_not_split()
+    test_invalid_member_skipped()
+    test_text_after_object_ignored()
+    test_truncated_stream()
+    print("\n✅ All JSON stream tests passed\n")
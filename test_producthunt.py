@@ -2,10 +2,11 @@
 Test Product Hunt API integration.
 """
 
+import asyncio
 from app.services.producthunt_service import producthunt_service
 
 
-def test_search():
+async def test_search():
     """Test searching for products."""
     
     print("\n" + "="*50)
@@ -13,7 +14,7 @@ def test_search():
     print("="*50)
     
     # Search for productivity tools
-    products = producthunt_service.search_products("productivity", limit=10)
+    products = await producthunt_service.search_products("productivity", limit=10)
     
     if products:
         print(f"\n✅ SUCCESS! Found {len(products)} products\n")
@@ -30,4 +31,4 @@ def test_search():
 
 
 if __name__ == "__main__":
-    test_search()
\ No newline at end of file
+    asyncio.run(test_search())
\ No newline at end of file
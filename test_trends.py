@@ -3,6 +3,7 @@ Simple SerpAPI Trends test - just one request.
 """
 
 from app.services.serp_trends_service import serp_trends_service
+import asyncio
 import time
 
 
@@ -11,7 +12,7 @@ time.sleep(10)
 
 print("\nTesting search trend analysis with SerpAPI...")
 
-result = serp_trends_service.analyze_keyword("AI apps for productivity")
+result = asyncio.run(serp_trends_service.analyze_keyword("AI apps for productivity"))
 
 if result.get("data_available"):
     print("\n✅ IT WORKS!\n")